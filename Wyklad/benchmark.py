@@ -0,0 +1,335 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import numpy as np
+from config import WIDTH, HEIGHT, SETTINGS_FILE, DEFAULT_BOMB_VISUAL_SCALE
+from settings_io import read_settings
+from physics_params import compile_params
+
+DEFAULT_COUNTS = [1000, 10000, 100000, 1000000]
+DEFAULT_SCALES = [0.1, 1.0, 5.0]
+DEFAULT_SMOKE_RESOLUTIONS = [32, 64, 128]
+SMOKE_WARMUP_STEPS = 90
+BENCH_DT = 1.0 / 60.0
+SCENE_WIDTH = int(WIDTH * 0.7)
+
+def time_frames(step, frames, warmup):
+    for _ in range(warmup):
+        step()
+    samples = np.empty(frames, dtype=np.float64)
+    for i in range(frames):
+        start = time.perf_counter_ns()
+        step()
+        samples[i] = time.perf_counter_ns() - start
+    samples /= 1e6
+    return {
+        'ms_mean': float(samples.mean()),
+        'ms_median': float(np.median(samples)),
+        'ms_p95': float(np.percentile(samples, 95)),
+        'ms_min': float(samples.min()),
+    }
+
+def finish_gl(draw):
+    from OpenGL.GL import glFinish
+    def step():
+        draw()
+        glFinish()
+    return step
+
+def setup_cloud(engine, count, scale, params, seed, render):
+    if engine == 'objects':
+        from entities.particle import Particle
+        random.seed(seed)
+        shared = compile_params(params)
+        particles = [Particle(initial_explosion_scale=scale, params=shared) for _ in range(count)]
+        for p in particles: p.activate()
+        def update():
+            for p in particles: p.update(BENCH_DT)
+        def draw():
+            for p in particles:
+                if p.active: p.draw()
+        return update, draw
+    from entities.cloud_system import CloudParticleSystem
+    from entities.random_streams import RandomStreams
+    cloud = CloudParticleSystem(count, scale, params, RandomStreams(seed))
+    cloud.activate()
+    def update():
+        cloud.update(BENCH_DT)
+    if not render:
+        return update, None
+    from graphics.particle_renderer import ParticleRenderer
+    from graphics.point_data import cloud_point_data
+    renderer = ParticleRenderer(count)
+    def draw_frame():
+        renderer.upload(*cloud_point_data(cloud))
+        renderer.draw()
+    return update, draw_frame
+
+def setup_sand(engine, count, scale, params, seed, render):
+    if engine == 'objects':
+        from entities.sand_particle import SandParticle
+        random.seed(seed)
+        shared = compile_params(params)
+        particles = [SandParticle(initial_explosion_scale=scale, params=shared) for _ in range(count)]
+        for p in particles: p.activate()
+        def update():
+            for p in particles: p.update(BENCH_DT)
+        def draw():
+            for p in particles:
+                if p.active: p.draw()
+        return update, draw
+    from entities.sand_system import SandParticleSystem
+    from entities.random_streams import RandomStreams
+    sand = SandParticleSystem(count, scale, params, RandomStreams(seed))
+    sand.activate()
+    def update():
+        sand.update(BENCH_DT)
+    if not render:
+        return update, None
+    from graphics.particle_renderer import ParticleRenderer
+    from graphics.point_data import sand_point_data
+    renderer = ParticleRenderer(count)
+    def draw_frame():
+        renderer.upload(*sand_point_data(sand))
+        renderer.draw()
+    return update, draw_frame
+
+def setup_shockwave(engine, count, scale, params, seed, render):
+    from entities.shockwave import Shockwave
+    shockwave = Shockwave()
+    shockwave.start(scale)
+    def update():
+        shockwave.update(BENCH_DT)
+        if not shockwave.active:
+            shockwave.start(scale)
+    if not render:
+        return update, None
+    from graphics.drawing import draw_shockwave
+    from graphics.scene_cache import SceneGeometryCache
+    scene_cache = SceneGeometryCache()
+    def draw_frame():
+        draw_shockwave(shockwave, draw_ring=scene_cache.draw_unit_circle)
+    return update, draw_frame
+
+def setup_bomb(engine, count, scale, params, seed, render):
+    from entities.bomb import Bomb
+    bomb = Bomb()
+    def update():
+        bomb.update(BENCH_DT)
+        if bomb.exploded:
+            bomb.reset()
+    if not render:
+        return update, None
+    from graphics.drawing import load_bomb_mesh, draw_bomb
+    mesh = load_bomb_mesh("bomb.obj")
+    def draw_frame():
+        draw_bomb(bomb, mesh, scale=params.get('bomb_visual_scale', DEFAULT_BOMB_VISUAL_SCALE))
+    return update, draw_frame
+
+CASES = {
+    'cloud': (setup_cloud, ['objects', 'numpy'], True),
+    'sand': (setup_sand, ['objects', 'numpy'], True),
+    'shockwave': (setup_shockwave, ['default'], False),
+    'bomb': (setup_bomb, ['default'], False),
+}
+
+def init_render_state():
+    from OpenGL.GL import (
+        glViewport, glMatrixMode, glLoadIdentity, glTranslatef, glEnable, glBlendFunc,
+        GL_PROJECTION, GL_MODELVIEW, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA,
+        GL_PROGRAM_POINT_SIZE, GL_DEPTH_TEST
+    )
+    from OpenGL.GLU import gluPerspective
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glEnable(GL_PROGRAM_POINT_SIZE)
+    glEnable(GL_DEPTH_TEST)
+    glViewport(0, 0, SCENE_WIDTH, HEIGHT)
+    glMatrixMode(GL_PROJECTION); glLoadIdentity()
+    gluPerspective(45, (SCENE_WIDTH / float(HEIGHT)), 0.1, 50.0)
+    glMatrixMode(GL_MODELVIEW); glLoadIdentity()
+    glTranslatef(0.0, -0.6, -6.0)
+
+def run_benchmarks(args, params):
+    results = []
+    for case in args.cases:
+        setup, engines, counted = CASES[case]
+        counts = args.counts if counted else [1]
+        for engine in engines:
+            if args.engines and engine not in args.engines and engine != 'default':
+                continue
+            for count in counts:
+                if engine == 'objects' and count > args.objects_max_count:
+                    continue
+                for scale in args.scales:
+                    update, draw = setup(engine, count, scale, params, args.seed, args.render)
+                    entry = {'case': case, 'engine': engine, 'count': count, 'scale': scale}
+                    entry['update'] = time_frames(update, args.frames, args.warmup)
+                    if args.render and draw is not None:
+                        entry['draw'] = time_frames(finish_gl(draw), args.frames, args.warmup)
+                    results.append(entry)
+                    draw_ms = entry['draw']['ms_median'] if 'draw' in entry else float('nan')
+                    print(f"{case:10s} {engine:8s} n={count:<8d} scale={scale:<4.1f} "
+                          f"update={entry['update']['ms_median']:9.3f} ms  draw={draw_ms:9.3f} ms", flush=True)
+    return results
+
+def run_scaling(args, params):
+    from entities.cloud_system import CloudParticleSystem
+    from entities.sand_system import SandParticleSystem
+    from entities.random_streams import RandomStreams
+    from parallel_update import ParallelUpdater
+    results = []
+    for case, system_class in (('cloud', CloudParticleSystem), ('sand', SandParticleSystem)):
+        if case not in args.cases:
+            continue
+        single = None
+        for workers in args.scaling_workers:
+            system = system_class(args.scaling_count, 1.0, params, RandomStreams(args.seed))
+            system.activate()
+            updater = ParallelUpdater(workers, backend=args.scaling_backend)
+            timing = time_frames(lambda: updater.update(system, BENCH_DT), args.frames, args.warmup)
+            updater.close()
+            single = single or timing['ms_median']
+            entry = {'case': case, 'workers': workers, 'count': args.scaling_count,
+                     'backend': args.scaling_backend, 'update': timing, 'speedup': single / timing['ms_median']}
+            results.append(entry)
+            print(f"{case:10s} wątki={workers:<3d} n={args.scaling_count:<8d} "
+                  f"update={timing['ms_median']:9.3f} ms  przyspieszenie=x{entry['speedup']:.2f}", flush=True)
+    return results
+
+def run_smoke(args, params):
+    from entities.cloud_system import CloudParticleSystem
+    from entities.random_streams import RandomStreams
+    from graphics.smoke_grid import SmokeGrid
+    results = []
+    for count in args.counts:
+        cloud = CloudParticleSystem(count, 1.0, params, RandomStreams(args.seed))
+        cloud.activate()
+        # Rozwinięta chmura (pień i kapelusz), a nie punkt startowy.
+        for _ in range(SMOKE_WARMUP_STEPS):
+            cloud.update(BENCH_DT)
+        idx = cloud.active_indices()
+        positions = np.column_stack((cloud.x[idx], cloud.y[idx], cloud.z[idx]))
+        for resolution in args.smoke_resolutions:
+            grid = SmokeGrid(resolution)
+            entry = {'case': 'smoke', 'count': count, 'resolution': resolution,
+                     'splat': time_frames(lambda: grid.splat(positions), args.frames, args.warmup)}
+            if args.render:
+                from graphics.smoke_renderer import SmokeRenderer
+                renderer = SmokeRenderer(resolution)
+                entry['upload'] = time_frames(finish_gl(lambda: renderer.upload(grid)), args.frames, args.warmup)
+                entry['draw'] = time_frames(finish_gl(renderer.draw), args.frames, args.warmup)
+                renderer.delete()
+            results.append(entry)
+            upload_ms = entry['upload']['ms_median'] if 'upload' in entry else float('nan')
+            draw_ms = entry['draw']['ms_median'] if 'draw' in entry else float('nan')
+            print(f"smoke      n={count:<8d} siatka={resolution:>3d}^3 splat={entry['splat']['ms_median']:9.3f} ms  "
+                  f"upload={upload_ms:9.3f} ms  draw={draw_ms:9.3f} ms", flush=True)
+    return results
+
+def result_key(entry):
+    return (entry['case'], entry['engine'], entry['count'], entry['scale'])
+
+def compare_results(results, baseline_file, tolerance):
+    with open(baseline_file, 'r') as f:
+        baseline = {result_key(e): e for e in json.load(f)['results']}
+    regressions = 0
+    for entry in results:
+        old = baseline.get(result_key(entry))
+        if old is None:
+            continue
+        for stage in ('update', 'draw'):
+            if stage not in entry or stage not in old:
+                continue
+            ratio = entry[stage]['ms_median'] / max(old[stage]['ms_median'], 1e-9)
+            if ratio > 1.0 + tolerance:
+                regressions += 1
+                print(f"REGRESJA {stage}: {result_key(entry)} {old[stage]['ms_median']:.3f} -> {entry[stage]['ms_median']:.3f} ms (x{ratio:.2f})")
+    return regressions
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Pomiar kosztu update/draw chmury, piasku, fali i bomby.")
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES))
+    parser.add_argument('--engines', nargs='+', choices=['objects', 'numpy'], default=None)
+    parser.add_argument('--counts', nargs='+', type=int, default=DEFAULT_COUNTS)
+    parser.add_argument('--scales', nargs='+', type=float, default=DEFAULT_SCALES)
+    parser.add_argument('--objects-max-count', type=int, default=100000,
+                        help="Największa liczba cząstek dla wersji obiektowej (jest bardzo wolna).")
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--settings', default=SETTINGS_FILE)
+    parser.add_argument('--render', action='store_true', help="Mierz też rysowanie w kontekście offscreen.")
+    parser.add_argument('--gl-platform', choices=['egl', 'osmesa'], default='egl')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', default=None, help="Poprzedni plik JSON do porównania.")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--scaling', action='store_true',
+                        help="Zamiast zwykłych przypadków zmierz skalowanie kroku cząstek z liczbą wątków.")
+    parser.add_argument('--scaling-count', type=int, default=1000000)
+    parser.add_argument('--scaling-workers', nargs='+', type=int, default=None,
+                        help="Liczby wątków do zmierzenia (domyślnie 1, 2, 4, ... do liczby rdzeni).")
+    parser.add_argument('--scaling-backend', choices=['threads', 'processes'], default='threads')
+    parser.add_argument('--smoke', action='store_true',
+                        help="Zamiast zwykłych przypadków zmierz budowę siatki dymu (liczby cząstek z --counts).")
+    parser.add_argument('--smoke-resolutions', nargs='+', type=int, default=DEFAULT_SMOKE_RESOLUTIONS)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    context = None
+    if args.render:
+        from graphics.offscreen import select_offscreen_platform
+        select_offscreen_platform(args.gl_platform)
+        from graphics.offscreen import OffscreenContext
+        context = OffscreenContext(SCENE_WIDTH, HEIGHT)
+        init_render_state()
+    params = read_settings(args.settings)
+    smoke = None
+    if args.scaling:
+        cores = os.cpu_count() or 1
+        args.scaling_workers = args.scaling_workers or sorted({min(2 ** i, cores) for i in range(cores.bit_length() + 1)})
+        results = []
+        scaling = run_scaling(args, params)
+    elif args.smoke:
+        results = []
+        scaling = None
+        smoke = run_smoke(args, params)
+    else:
+        results = run_benchmarks(args, params)
+        scaling = None
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'frames': args.frames,
+            'warmup': args.warmup,
+            'render': args.render,
+        },
+        'results': results,
+    }
+    if scaling is not None:
+        report['meta']['cpu_count'] = os.cpu_count()
+        report['scaling'] = scaling
+    if smoke is not None:
+        report['smoke'] = smoke
+    if args.render:
+        from OpenGL.GL import glGetString, GL_RENDERER, GL_VERSION
+        report['meta']['gl_renderer'] = glGetString(GL_RENDERER).decode()
+        report['meta']['gl_version'] = glGetString(GL_VERSION).decode()
+        context.destroy()
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"Zapisano wyniki do {args.output}")
+    if args.compare:
+        return 1 if compare_results(results, args.compare, args.tolerance) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,3 +15,29 @@ DEFAULT_SAND_SPEED_MAX = 2.5
 DEFAULT_SAND_GRAVITY_MULTIPLIER = 0.2 
 DEFAULT_SAND_LIFE_MIN = 0.5
 DEFAULT_SAND_LIFE_MAX = 1.5
+DEFAULT_EXPLOSION_SCALE = 1.0
+DEFAULT_BOMB_VISUAL_SCALE = 0.5
+RENDER_FPS = 60
+PHYSICS_HZ = 60
+MAX_PHYSICS_SUBSTEPS = 5
+PARTICLE_BUDGET_POLICY = "recycle"
+BARRAGE_SIZE = 12
+MAX_EXPLOSIONS = 2 * BARRAGE_SIZE + 1
+TIMELINE_LENGTH = 20.0
+TIMELINE_KEYFRAME_INTERVAL = 1.0
+UPDATE_WORKERS = 1
+UPDATE_SHARD_SIZE = 65536
+PROCESS_UPDATE_THRESHOLD = 2000000
+TERRAIN_RESOLUTION = 512
+TERRAIN_EXTENT = 10.0
+TERRAIN_MIN_HEIGHT = -1.0
+CRATER_DEPTH = 0.3
+SAND_GRAIN_VOLUME = 0.00005
+SHOCKWAVE_IMPULSE = 0.6
+SHOCKWAVE_HEIGHT = 0.5
+SHOCKWAVE_CELL_SIZE = 0.25
+SMOKE_RESOLUTION = 64
+SMOKE_BLUR_VOXELS = 2
+# Przekrój pochłaniania jednej cząstki chmury (jednostki sceny ^ 2), dobrany do wyglądu chmury z punktów.
+SMOKE_ABSORPTION = 0.004
+SMOKE_BOX_SNAP = 0.25
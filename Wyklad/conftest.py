@@ -0,0 +1 @@
+# Katalog Wyklad na sys.path, żeby testy importowały moduły tak jak program (entities.…, graphics.…).
@@ -0,0 +1,165 @@
+import numpy as np
+from config import GROUND_LEVEL, NUM_PARTICLES
+from physics_params import compile_params
+from entities.particle_pool import ParticlePool
+from entities.random_streams import RandomStreams, EVENT_SPAWN, EVENT_CLOUD_PHASE
+
+PHASE_STEM = 0
+PHASE_CLOUD = 1
+
+class CloudParticleSystem:
+    floor = GROUND_LEVEL - 0.2
+
+    def __init__(self, count=NUM_PARTICLES, initial_explosion_scale=1.0, params=None, streams=None):
+        self.count = count
+        self.explosion_scale = initial_explosion_scale
+        self.params = compile_params(params)
+        self.streams = streams if streams is not None else RandomStreams()
+        self.x = np.zeros(count, dtype=np.float32)
+        self.y = np.zeros(count, dtype=np.float32)
+        self.z = np.zeros(count, dtype=np.float32)
+        self.vx = np.zeros(count, dtype=np.float32)
+        self.vy = np.zeros(count, dtype=np.float32)
+        self.vz = np.zeros(count, dtype=np.float32)
+        self.size = np.zeros(count, dtype=np.float32)
+        self.life = np.zeros(count, dtype=np.float32)
+        self.age = np.zeros(count, dtype=np.float32)
+        self.phase = np.zeros(count, dtype=np.uint8)
+        self.active = np.zeros(count, dtype=np.uint8)
+        self.scale = np.full(count, initial_explosion_scale, dtype=np.float32)
+        # Numer cząstki w jej wybuchu: razem z właścicielem slotu wyznacza jej liczby losowe.
+        self.serial = np.zeros(count, dtype=np.uint32)
+        self.pool = ParticlePool(count)
+        self.prev_x = np.zeros(count, dtype=np.float32)
+        self.prev_y = np.zeros(count, dtype=np.float32)
+        self.prev_z = np.zeros(count, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self.phase[:] = PHASE_STEM
+        self.x[:] = 0.0
+        self.y[:] = GROUND_LEVEL
+        self.z[:] = 0.0
+        self.vx[:] = 0.0
+        self.vy[:] = 0.0
+        self.vz[:] = 0.0
+        self.age[:] = 0.0
+        self.life[:] = 0.0
+        self.active[:] = 0
+        self.pool.reset()
+        self.save_previous()
+
+    def set_explosion_scale(self, scale, owner=None):
+        self.explosion_scale = scale
+        if owner is None:
+            self.scale[:] = scale
+        else:
+            self.scale[self.pool.slots_of(owner)] = scale
+
+    def activate(self):
+        self.active[:] = 0
+        self.pool.reset()
+        self.spawn(self.count)
+
+    def spawn(self, n, origin=(0.0, 0.0), scale=None, owner=0):
+        if scale is None:
+            scale = self.explosion_scale
+        idx = self.pool.allocate(n, owner)
+        n = idx.size
+        self.serial[idx] = np.arange(n)
+        u = self.streams.uniforms(owner, self.serial[idx], EVENT_SPAWN, 4)
+        self.phase[idx] = PHASE_STEM
+        self.x[idx] = origin[0]
+        self.y[idx] = GROUND_LEVEL
+        self.z[idx] = origin[1]
+        self.scale[idx] = scale
+
+        angle_stem = 2 * np.pi * u[0]
+        radius_stem = (0.005 + 0.015 * u[1]) * scale
+        self.vx[idx] = radius_stem * np.cos(angle_stem)
+        self.vz[idx] = radius_stem * np.sin(angle_stem)
+        self.vy[idx] = (1.5 + 0.5 * u[2]) * scale
+
+        self.size[idx] = 12 + 8 * u[3]
+        particle_life_multiplier = self.params.particle_life_multiplier
+        self.life[idx] = 4.0 + (scale - 1.0) * particle_life_multiplier
+        self.age[idx] = 0.0
+        self.active[idx] = 1
+        self.prev_x[idx] = self.x[idx]
+        self.prev_y[idx] = self.y[idx]
+        self.prev_z[idx] = self.z[idx]
+        return idx
+
+    def release(self, idx):
+        self.active[idx] = 0
+        self.pool.release(idx)
+
+    def reclaim(self, n, keep_owner=None):
+        self.release(self.pool.oldest_slots(n, keep_owner))
+
+    def update(self, dt):
+        if not self.active.any():
+            return
+        self.release(self.integrate(0, self.count, dt))
+
+    # Zapisuje tylko do zakresu [start, stop) i nie dotyka puli, więc zakresy można liczyć równolegle
+    def integrate(self, start, stop, dt):
+        part = slice(start, stop)
+        active = self.active[part].view(bool)
+        if not active.any():
+            return np.empty(0, dtype=np.int64)
+        scale = self.scale[part]
+        phase = self.phase[part]
+        x, y, z = self.x[part], self.y[part], self.z[part]
+        vx, vy, vz = self.vx[part], self.vy[part], self.vz[part]
+        stem = active & (phase == PHASE_STEM)
+        cloud = active & (phase == PHASE_CLOUD)
+        step = active * np.float32(dt)
+
+        self.age[part] += step
+        x += vx * step
+        y += vy * step
+        z += vz * step
+
+        cloud_gravity = self.params.cloud_gravity
+        vy -= np.where(stem, 0.8 * dt * scale, np.where(cloud, cloud_gravity * dt * scale, 0.0)).astype(np.float32)
+        drag = np.where(cloud, self.params.drag_factor(dt), 1.0).astype(np.float32)
+        vx *= drag
+        vz *= drag
+
+        switching = np.flatnonzero(stem & (vy <= 0.01 * scale))
+        if switching.size:
+            self._start_cloud_phase(start + switching)
+
+        life = self.life[part]
+        life -= step
+        return start + np.flatnonzero(active & ((life <= 0) | (y < self.floor)))
+
+    def _start_cloud_phase(self, idx):
+        scale = self.scale[idx]
+        u = self.streams.uniforms(self.pool.owner[idx], self.serial[idx], EVENT_CLOUD_PHASE, 3)
+        self.phase[idx] = PHASE_CLOUD
+        cloud_spread_angle = 2 * np.pi * u[0]
+        spread_min = self.params.cloud_spread_speed_min
+        spread_max = self.params.cloud_spread_speed_max
+        cloud_spread_speed = (spread_min + (spread_max - spread_min) * u[1]) * scale
+        self.vx[idx] = cloud_spread_speed * np.cos(cloud_spread_angle)
+        self.vz[idx] = cloud_spread_speed * np.sin(cloud_spread_angle)
+        lift_min = self.params.cloud_initial_lift_min
+        lift_max = self.params.cloud_initial_lift_max
+        self.vy[idx] = (lift_min + (lift_max - lift_min) * u[2]) * scale
+
+    def active_indices(self):
+        return np.flatnonzero(self.active)
+
+    def save_previous(self):
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+        np.copyto(self.prev_z, self.z)
+
+    def interpolated_positions(self, alpha, idx):
+        positions = np.empty((idx.size, 3), dtype=np.float32)
+        for axis, (prev, current) in enumerate(((self.prev_x, self.x), (self.prev_y, self.y), (self.prev_z, self.z))):
+            p = prev[idx]
+            positions[:, axis] = p + (current[idx] - p) * np.float32(alpha)
+        return positions
@@ -0,0 +1,67 @@
+import numpy as np
+from config import GROUND_LEVEL
+from physics_params import compile_params
+from entities.random_streams import EVENT_SPAWN, EVENT_CLOUD_PHASE
+
+STEM_DECELERATION = 0.8
+STEM_END_SPEED = 0.01
+
+# Kolumny tablicy parametrów startowych (tak samo ułożone w VBO shadera).
+LAUNCH_COLUMNS = (
+    'x0', 'z0', 't0', 'scale',
+    'stem_vx', 'stem_vy', 'stem_vz', 'size',
+    'cloud_vx', 'cloud_vy', 'cloud_vz', 'life',
+)
+X0, Z0, T0, SCALE, STEM_VX, STEM_VY, STEM_VZ, SIZE, CLOUD_VX, CLOUD_VY, CLOUD_VZ, LIFE = range(len(LAUNCH_COLUMNS))
+
+# Te same strumienie losowe co w CloudParticleSystem, więc shader i CPU dostają te same cząstki
+def launch_parameters(streams, n, origin=(0.0, 0.0), scale=1.0, t0=0.0, params=None, owner=0):
+    params = compile_params(params)
+    serial = np.arange(n)
+    u = streams.uniforms(owner, serial, EVENT_SPAWN, 4)
+    v = streams.uniforms(owner, serial, EVENT_CLOUD_PHASE, 3)
+    launch = np.empty((n, len(LAUNCH_COLUMNS)), dtype=np.float32)
+    launch[:, X0] = origin[0]
+    launch[:, Z0] = origin[1]
+    launch[:, T0] = t0
+    launch[:, SCALE] = scale
+    angle_stem = 2 * np.pi * u[0]
+    radius_stem = (0.005 + 0.015 * u[1]) * scale
+    launch[:, STEM_VX] = radius_stem * np.cos(angle_stem)
+    launch[:, STEM_VZ] = radius_stem * np.sin(angle_stem)
+    launch[:, STEM_VY] = (1.5 + 0.5 * u[2]) * scale
+    launch[:, SIZE] = 12 + 8 * u[3]
+    spread_angle = 2 * np.pi * v[0]
+    spread_min = params.cloud_spread_speed_min
+    spread_max = params.cloud_spread_speed_max
+    spread_speed = (spread_min + (spread_max - spread_min) * v[1]) * scale
+    launch[:, CLOUD_VX] = spread_speed * np.cos(spread_angle)
+    launch[:, CLOUD_VZ] = spread_speed * np.sin(spread_angle)
+    lift_min = params.cloud_initial_lift_min
+    lift_max = params.cloud_initial_lift_max
+    launch[:, CLOUD_VY] = (lift_min + (lift_max - lift_min) * v[2]) * scale
+    particle_life_multiplier = params.particle_life_multiplier
+    launch[:, LIFE] = 4.0 + (scale - 1.0) * particle_life_multiplier
+    return launch
+
+# Tor w postaci zamkniętej (ten sam wzór w graphics/gpu_cloud.py), bez pchnięć fal uderzeniowych
+def evaluate(launch, time, params=None):
+    params = compile_params(params)
+    gravity = params.cloud_gravity
+    k = params.cloud_air_resistance
+    scale = launch[:, SCALE]
+    age = time - launch[:, T0]
+    deceleration = STEM_DECELERATION * scale
+    stem_time = np.maximum((launch[:, STEM_VY] - STEM_END_SPEED * scale) / deceleration, 0.0)
+    e = np.clip(age, 0.0, stem_time)
+    x = launch[:, X0] + launch[:, STEM_VX] * e
+    y = GROUND_LEVEL + launch[:, STEM_VY] * e - 0.5 * deceleration * e * e
+    z = launch[:, Z0] + launch[:, STEM_VZ] * e
+    tau = np.maximum(age - stem_time, 0.0)
+    drift = (1.0 - np.exp(-k * tau)) / k if k > 1e-6 else tau
+    x = x + launch[:, CLOUD_VX] * drift
+    y = y + launch[:, CLOUD_VY] * tau - 0.5 * gravity * scale * tau * tau
+    z = z + launch[:, CLOUD_VZ] * drift
+    phase = (age > stem_time).astype(np.uint8)
+    alive = (age >= 0.0) & (age < launch[:, LIFE]) & (y >= GROUND_LEVEL - 0.2)
+    return np.column_stack((x, y, z)).astype(np.float32), phase, alive
@@ -0,0 +1,62 @@
+from config import CRATER_DEPTH
+from entities.bomb import Bomb
+from entities.shockwave import Shockwave
+
+class Explosion:
+    def __init__(self, explosion_id, x=0.0, z=0.0, scale=1.0, delay=0.0,
+                 cloud_budget=None, sand_budget=None):
+        self.id = explosion_id
+        self.x = x
+        self.z = z
+        self.scale = scale
+        self.delay = delay
+        self.start_delay = delay
+        self.cloud_budget = cloud_budget
+        self.sand_budget = sand_budget
+        self.bomb = Bomb(x, z)
+        self.shockwave = Shockwave(x, z)
+        self.detonated = False
+        self.previous_bomb_y = self.bomb.y
+        self.previous_shockwave_radius = self.shockwave.radius
+
+    @property
+    def dropping(self):
+        return self.delay <= 0.0
+
+    def reset(self):
+        self.delay = self.start_delay
+        self.bomb.reset()
+        self.shockwave.reset()
+        self.detonated = False
+        self.save_previous()
+
+    def save_previous(self):
+        self.previous_bomb_y = self.bomb.y
+        self.previous_shockwave_radius = self.shockwave.radius
+
+    def interpolated_bomb_position(self, alpha):
+        y = self.previous_bomb_y + (self.bomb.y - self.previous_bomb_y) * alpha
+        return (self.bomb.x, y, self.bomb.z)
+
+    def interpolated_shockwave_radius(self, alpha):
+        if self.shockwave.radius < self.previous_shockwave_radius:
+            return self.shockwave.radius
+        return self.previous_shockwave_radius + (self.shockwave.radius - self.previous_shockwave_radius) * alpha
+
+    def state_at(self, t):
+        drop_time = t - self.start_delay
+        x, y, z, exploded = self.bomb.state_at(max(drop_time, 0.0))
+        radius, active = 0.0, False
+        if exploded:
+            age = drop_time - self.bomb.fall_time()
+            radius, active = self.shockwave.state_at(age, self.scale)
+        return {
+            'dropping': drop_time >= 0.0, 'bomb': (x, y, z), 'exploded': exploded,
+            'shockwave_radius': radius, 'shockwave_active': active,
+        }
+
+    def crater_radius(self):
+        return 1.2 * self.scale
+
+    def crater_depth(self):
+        return CRATER_DEPTH * self.scale
@@ -2,19 +2,14 @@ import pygame
 from OpenGL.GL import *
 import random
 import math
-from config import (
-    GROUND_LEVEL, 
-    DEFAULT_CLOUD_SPREAD_SPEED_MIN, DEFAULT_CLOUD_SPREAD_SPEED_MAX,
-    DEFAULT_CLOUD_INITIAL_LIFT_MIN, DEFAULT_CLOUD_INITIAL_LIFT_MAX,
-    DEFAULT_CLOUD_AIR_RESISTANCE, DEFAULT_CLOUD_GRAVITY,
-    DEFAULT_PARTICLE_LIFE_MULTIPLIER
-)
+from config import GROUND_LEVEL
+from physics_params import compile_params
 
 class Particle:
     def __init__(self, initial_explosion_scale=1.0, params=None):
         self.active = False
         self.explosion_scale = initial_explosion_scale
-        self.params = params if params else {}
+        self.params = compile_params(params)
         self.reset() 
 
     def reset(self):
@@ -28,7 +23,7 @@ class Particle:
         self.vz = radius * math.sin(angle)
         self.vy = random.uniform(1.0, 1.3) * self.explosion_scale 
         self.size = random.uniform(12, 20)
-        particle_life_multiplier = self.params.get('particle_life_multiplier', DEFAULT_PARTICLE_LIFE_MULTIPLIER)
+        particle_life_multiplier = self.params.particle_life_multiplier
         self.life = 1.5 + (self.explosion_scale - 1.0) * (particle_life_multiplier / 2.0)
         self.age = 0.0
         self.active = False
@@ -46,7 +41,7 @@ class Particle:
         self.vy = random.uniform(1.5, 2.0) * self.explosion_scale
         
         self.size = random.uniform(12, 20) 
-        particle_life_multiplier = self.params.get('particle_life_multiplier', DEFAULT_PARTICLE_LIFE_MULTIPLIER)
+        particle_life_multiplier = self.params.particle_life_multiplier
         self.life = 4.0 + (self.explosion_scale - 1.0) * particle_life_multiplier 
         self.age = 0.0
         self.active = True
@@ -65,13 +60,13 @@ class Particle:
             if self.vy <= 0.01 * self.explosion_scale:
                 self.phase = "cloud"
                 cloud_spread_angle = random.uniform(0, 2 * math.pi)
-                spread_min = self.params.get('cloud_spread_speed_min', DEFAULT_CLOUD_SPREAD_SPEED_MIN)
-                spread_max = self.params.get('cloud_spread_speed_max', DEFAULT_CLOUD_SPREAD_SPEED_MAX)
+                spread_min = self.params.cloud_spread_speed_min
+                spread_max = self.params.cloud_spread_speed_max
                 cloud_spread_speed = random.uniform(spread_min, spread_max) * self.explosion_scale 
                 self.vx = cloud_spread_speed * math.cos(cloud_spread_angle)
                 self.vz = cloud_spread_speed * math.sin(cloud_spread_angle)
-                lift_min = self.params.get('cloud_initial_lift_min', DEFAULT_CLOUD_INITIAL_LIFT_MIN)
-                lift_max = self.params.get('cloud_initial_lift_max', DEFAULT_CLOUD_INITIAL_LIFT_MAX)
+                lift_min = self.params.cloud_initial_lift_min
+                lift_max = self.params.cloud_initial_lift_max
                 self.vy = random.uniform(lift_min, lift_max) * self.explosion_scale
 
         elif self.phase == "cloud":
@@ -79,12 +74,12 @@ class Particle:
             self.y += self.vy * dt
             self.z += self.vz * dt
             
-            cloud_gravity = self.params.get('cloud_gravity', DEFAULT_CLOUD_GRAVITY)
+            cloud_gravity = self.params.cloud_gravity
             self.vy -= cloud_gravity * dt * self.explosion_scale 
             
-            air_resistance = self.params.get('cloud_air_resistance', DEFAULT_CLOUD_AIR_RESISTANCE)
-            self.vx *= (1 - air_resistance * dt) 
-            self.vz *= (1 - air_resistance * dt)
+            drag = self.params.drag_factor(dt)
+            self.vx *= drag
+            self.vz *= drag
 
         self.life -= dt
         if self.life <= 0 or self.y < GROUND_LEVEL - 0.2: 
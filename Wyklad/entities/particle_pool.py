@@ -0,0 +1,47 @@
+import numpy as np
+
+NO_OWNER = -1
+
+class ParticlePool:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.free = np.empty(capacity, dtype=np.int64)
+        self.owner = np.empty(capacity, dtype=np.int32)
+        self.reset()
+
+    def reset(self):
+        self.free[:] = np.arange(self.capacity - 1, -1, -1)
+        self.free_count = self.capacity
+        self.owner[:] = NO_OWNER
+
+    def allocate(self, n, owner):
+        n = min(n, self.free_count)
+        start = self.free_count - n
+        slots = self.free[start:self.free_count].copy()
+        self.free_count = start
+        self.owner[slots] = owner
+        return slots
+
+    def release(self, slots):
+        n = len(slots)
+        if n == 0:
+            return
+        self.owner[slots] = NO_OWNER
+        self.free[self.free_count:self.free_count + n] = slots
+        self.free_count += n
+
+    def used_count(self):
+        return self.capacity - self.free_count
+
+    def slots_of(self, owner):
+        return np.flatnonzero(self.owner == owner)
+
+    def oldest_slots(self, n, keep_owner=None):
+        candidates = self.owner >= 0
+        if keep_owner is not None:
+            candidates &= self.owner != keep_owner
+        idx = np.flatnonzero(candidates)
+        if idx.size <= n:
+            return idx
+        order = np.argpartition(self.owner[idx], n - 1)[:n]
+        return idx[order]
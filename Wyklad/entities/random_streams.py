@@ -0,0 +1,47 @@
+import numpy as np
+
+# Zdarzenia, przy których cząstka losuje liczby (część licznika Philox).
+EVENT_SPAWN = 0
+EVENT_CLOUD_PHASE = 1
+
+PHILOX_M0 = np.uint64(0xD2511F53)
+PHILOX_M1 = np.uint64(0xCD9E8D57)
+PHILOX_W0 = 0x9E3779B9
+PHILOX_W1 = 0xBB67AE85
+MASK32 = np.uint64(0xFFFFFFFF)
+
+# Philox4x32-10 (Salmon i in., 2011); iloczyny 32x32 bity liczone w uint64
+def philox4x32(counter, key, rounds=10):
+    c0, c1, c2, c3 = (np.asarray(word, dtype=np.uint64) for word in counter)
+    k0, k1 = int(key[0]), int(key[1])
+    for _ in range(rounds):
+        p0 = PHILOX_M0 * c0
+        p1 = PHILOX_M1 * c2
+        c0, c1, c2, c3 = (
+            (p1 >> np.uint64(32)) ^ c1 ^ np.uint64(k0), p1 & MASK32,
+            (p0 >> np.uint64(32)) ^ c3 ^ np.uint64(k1), p0 & MASK32,
+        )
+        k0 = (k0 + PHILOX_W0) & 0xFFFFFFFF
+        k1 = (k1 + PHILOX_W1) & 0xFFFFFFFF
+    return np.stack((c0, c1, c2, c3)).astype(np.uint32)
+
+# Liczby losowe jako czysta funkcja (ziarno, wybuch, numer cząstki, zdarzenie), bez stanu
+class RandomStreams:
+    def __init__(self, seed=None):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.key = tuple(int(word) for word in seed.generate_state(2))
+
+    def bits(self, owner, serial, event, count):
+        serial = np.asarray(serial, dtype=np.uint32)
+        owner = np.broadcast_to(np.asarray(owner, dtype=np.uint32), serial.shape)
+        event = np.full(serial.shape, event, dtype=np.uint32)
+        blocks = -(-count // 4)
+        out = np.empty((blocks * 4, serial.size), dtype=np.uint32)
+        for block in range(blocks):
+            counter = (serial, owner, event, np.full(serial.shape, block, dtype=np.uint32))
+            out[4 * block:4 * block + 4] = philox4x32(counter, self.key)
+        return out[:count]
+
+    def uniforms(self, owner, serial, event, count):
+        return (self.bits(owner, serial, event, count) >> 8).astype(np.float32) * np.float32(2.0 ** -24)
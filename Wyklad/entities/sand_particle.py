@@ -2,18 +2,14 @@ import pygame
 from OpenGL.GL import *
 import random
 import math
-from config import (
-    GROUND_LEVEL,
-    DEFAULT_SAND_SPEED_MIN, DEFAULT_SAND_SPEED_MAX,
-    DEFAULT_SAND_GRAVITY_MULTIPLIER,
-    DEFAULT_SAND_LIFE_MIN, DEFAULT_SAND_LIFE_MAX
-)
+from config import GROUND_LEVEL
+from physics_params import compile_params
 
 class SandParticle:
     def __init__(self, initial_explosion_scale=1.0, params=None):
         self.active = False
         self.explosion_scale = initial_explosion_scale
-        self.params = params if params else {}
+        self.params = compile_params(params)
         self.reset()
 
     def reset(self):
@@ -23,8 +19,8 @@ class SandParticle:
         
         angle_horizontal = random.uniform(0, 2 * math.pi)
         angle_vertical = random.uniform(math.pi / 6, math.pi / 3)
-        speed_min = self.params.get('sand_speed_min', DEFAULT_SAND_SPEED_MIN)
-        speed_max = self.params.get('sand_speed_max', DEFAULT_SAND_SPEED_MAX)
+        speed_min = self.params.sand_speed_min
+        speed_max = self.params.sand_speed_max
         speed = random.uniform(speed_min, speed_max) * self.explosion_scale 
         
         self.vx = speed * math.cos(angle_horizontal) * math.sin(angle_vertical)
@@ -32,8 +28,8 @@ class SandParticle:
         self.vy = speed * math.cos(angle_vertical)
         
         self.size = random.uniform(2, 5)
-        life_min = self.params.get('sand_life_min', DEFAULT_SAND_LIFE_MIN)
-        life_max = self.params.get('sand_life_max', DEFAULT_SAND_LIFE_MAX)
+        life_min = self.params.sand_life_min
+        life_max = self.params.sand_life_max
         self.life = random.uniform(life_min, life_max)
         self.age = 0.0
         self.active = False
@@ -41,8 +37,7 @@ class SandParticle:
         g = random.uniform(0.5, 0.7)
         b = random.uniform(0.3, 0.5)
         self.color = (r, g, b)
-        gravity_multiplier = self.params.get('sand_gravity_multiplier', DEFAULT_SAND_GRAVITY_MULTIPLIER)
-        self.gravity = 9.8 * gravity_multiplier * self.explosion_scale
+        self.gravity = self.params.sand_gravity * self.explosion_scale
 
     def activate(self):
         self.x = 0.0 
@@ -50,19 +45,18 @@ class SandParticle:
         self.z = 0.0
         angle_horizontal = random.uniform(0, 2 * math.pi)
         angle_vertical = random.uniform(math.pi / 6, math.pi / 3)
-        speed_min = self.params.get('sand_speed_min', DEFAULT_SAND_SPEED_MIN)
-        speed_max = self.params.get('sand_speed_max', DEFAULT_SAND_SPEED_MAX)
+        speed_min = self.params.sand_speed_min
+        speed_max = self.params.sand_speed_max
         speed = random.uniform(speed_min, speed_max) * self.explosion_scale 
         self.vx = speed * math.cos(angle_horizontal) * math.sin(angle_vertical)
         self.vz = speed * math.sin(angle_horizontal) * math.sin(angle_vertical)
         self.vy = speed * math.cos(angle_vertical)
-        life_min = self.params.get('sand_life_min', DEFAULT_SAND_LIFE_MIN)
-        life_max = self.params.get('sand_life_max', DEFAULT_SAND_LIFE_MAX)
+        life_min = self.params.sand_life_min
+        life_max = self.params.sand_life_max
         self.life = random.uniform(life_min, life_max)
         self.age = 0.0
         self.active = True
-        gravity_multiplier = self.params.get('sand_gravity_multiplier', DEFAULT_SAND_GRAVITY_MULTIPLIER)
-        self.gravity = 9.8 * gravity_multiplier * self.explosion_scale
+        self.gravity = self.params.sand_gravity * self.explosion_scale
 
     def update(self, dt):
         if not self.active:
@@ -0,0 +1,134 @@
+import numpy as np
+from config import GROUND_LEVEL, NUM_SAND_PARTICLES
+from physics_params import compile_params
+from entities.particle_pool import ParticlePool
+from entities.random_streams import RandomStreams, EVENT_SPAWN
+
+class SandParticleSystem:
+    # Wysokość, poniżej której ziarno znika; Simulation z terenem obniża ją pod dno kraterów.
+    floor = GROUND_LEVEL - 0.1
+
+    def __init__(self, count=NUM_SAND_PARTICLES, initial_explosion_scale=1.0, params=None, streams=None):
+        self.count = count
+        self.explosion_scale = initial_explosion_scale
+        self.params = compile_params(params)
+        self.streams = streams if streams is not None else RandomStreams()
+        self.x = np.zeros(count, dtype=np.float32)
+        self.y = np.zeros(count, dtype=np.float32)
+        self.z = np.zeros(count, dtype=np.float32)
+        self.vx = np.zeros(count, dtype=np.float32)
+        self.vy = np.zeros(count, dtype=np.float32)
+        self.vz = np.zeros(count, dtype=np.float32)
+        self.size = np.zeros(count, dtype=np.float32)
+        self.life = np.zeros(count, dtype=np.float32)
+        self.age = np.zeros(count, dtype=np.float32)
+        self.gravity = np.zeros(count, dtype=np.float32)
+        self.color = np.zeros((count, 3), dtype=np.float32)
+        self.active = np.zeros(count, dtype=np.uint8)
+        self.scale = np.full(count, initial_explosion_scale, dtype=np.float32)
+        self.serial = np.zeros(count, dtype=np.uint32)
+        self.pool = ParticlePool(count)
+        self.prev_x = np.zeros(count, dtype=np.float32)
+        self.prev_y = np.zeros(count, dtype=np.float32)
+        self.prev_z = np.zeros(count, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self.active[:] = 0
+        self.age[:] = 0.0
+        self.life[:] = 0.0
+        self.pool.reset()
+        self.save_previous()
+
+    def set_explosion_scale(self, scale, owner=None):
+        self.explosion_scale = scale
+        if owner is None:
+            self.scale[:] = scale
+        else:
+            self.scale[self.pool.slots_of(owner)] = scale
+
+    def activate(self):
+        self.active[:] = 0
+        self.pool.reset()
+        self.spawn(self.count)
+
+    def spawn(self, n, origin=(0.0, 0.0), scale=None, owner=0):
+        if scale is None:
+            scale = self.explosion_scale
+        idx = self.pool.allocate(n, owner)
+        self.serial[idx] = np.arange(idx.size)
+        u = self.streams.uniforms(owner, self.serial[idx], EVENT_SPAWN, 9)
+        self.scale[idx] = scale
+        self._launch(idx, u, origin, scale)
+        self.size[idx] = 2 + 3 * u[5]
+        self.color[idx, 0] = 0.6 + 0.2 * u[6]
+        self.color[idx, 1] = 0.5 + 0.2 * u[7]
+        self.color[idx, 2] = 0.3 + 0.2 * u[8]
+        self.active[idx] = 1
+        self.prev_x[idx] = self.x[idx]
+        self.prev_y[idx] = self.y[idx]
+        self.prev_z[idx] = self.z[idx]
+        return idx
+
+    def release(self, idx):
+        self.active[idx] = 0
+        self.pool.release(idx)
+
+    def reclaim(self, n, keep_owner=None):
+        self.release(self.pool.oldest_slots(n, keep_owner))
+
+    def update(self, dt):
+        if not self.active.any():
+            return
+        self.release(self.integrate(0, self.count, dt))
+
+    def integrate(self, start, stop, dt):
+        part = slice(start, stop)
+        active = self.active[part].view(bool)
+        if not active.any():
+            return np.empty(0, dtype=np.int64)
+        step = active * np.float32(dt)
+        vy, y, life = self.vy[part], self.y[part], self.life[part]
+        self.age[part] += step
+        vy -= self.gravity[part] * step
+        self.x[part] += self.vx[part] * step
+        y += vy * step
+        self.z[part] += self.vz[part] * step
+        life -= step
+        return start + np.flatnonzero(active & ((life <= 0) | (y < self.floor)))
+
+    def _launch(self, idx, u, origin, scale):
+        self.x[idx] = origin[0]
+        self.y[idx] = GROUND_LEVEL + (0.05 + 0.1 * u[0]) * scale
+        self.z[idx] = origin[1]
+
+        angle_horizontal = 2 * np.pi * u[1]
+        angle_vertical = np.pi / 6 + (np.pi / 6) * u[2]
+        speed_min = self.params.sand_speed_min
+        speed_max = self.params.sand_speed_max
+        speed = (speed_min + (speed_max - speed_min) * u[3]) * scale
+        horizontal = speed * np.sin(angle_vertical)
+        self.vx[idx] = horizontal * np.cos(angle_horizontal)
+        self.vz[idx] = horizontal * np.sin(angle_horizontal)
+        self.vy[idx] = speed * np.cos(angle_vertical)
+
+        life_min = self.params.sand_life_min
+        life_max = self.params.sand_life_max
+        self.life[idx] = life_min + (life_max - life_min) * u[4]
+        self.age[idx] = 0.0
+        self.gravity[idx] = self.params.sand_gravity * scale
+
+    def active_indices(self):
+        return np.flatnonzero(self.active)
+
+    def save_previous(self):
+        np.copyto(self.prev_x, self.x)
+        np.copyto(self.prev_y, self.y)
+        np.copyto(self.prev_z, self.z)
+
+    def interpolated_positions(self, alpha, idx):
+        positions = np.empty((idx.size, 3), dtype=np.float32)
+        for axis, (prev, current) in enumerate(((self.prev_x, self.x), (self.prev_y, self.y), (self.prev_z, self.z))):
+            p = prev[idx]
+            positions[:, axis] = p + (current[idx] - p) * np.float32(alpha)
+        return positions
@@ -1,9 +1,7 @@
-import pygame
-from OpenGL.GL import *
-import math
-
 class Shockwave:
-    def __init__(self):
+    def __init__(self, x=0.0, z=0.0):
+        self.x = x
+        self.z = z
         self.radius = 0.0
         self.active = False
         self.scale = 1.0
@@ -19,17 +17,15 @@ class Shockwave:
             if self.radius > 6.0 * self.scale:
                 self.active = False
 
-    def draw(self):
-        if not self.active:
-            return
-        glColor4f(0.8, 0.8, 0.8, 0.5) 
-        glBegin(GL_LINE_LOOP)
-        for i in range(64):
-            angle = 2 * math.pi * i / 64
-            x = self.radius * math.cos(angle)
-            z = self.radius * math.sin(angle)
-            glVertex3f(x, -0.6, z)
-        glEnd()
+    def max_radius(self, scale=None):
+        return 6.0 * (self.scale if scale is None else scale)
+
+    def state_at(self, age, scale=None):
+        scale = self.scale if scale is None else scale
+        radius = max(age, 0.0) * 1.5 * scale
+        if age < 0 or radius > 6.0 * scale:
+            return 0.0, False
+        return radius, True
 
     def reset(self):
         self.active = False
@@ -0,0 +1,76 @@
+import numpy as np
+from config import GROUND_LEVEL, SHOCKWAVE_IMPULSE, SHOCKWAVE_HEIGHT, SHOCKWAVE_CELL_SIZE
+
+class ShockwaveImpulse:
+    def __init__(self, strength=SHOCKWAVE_IMPULSE, height=SHOCKWAVE_HEIGHT, cell_size=SHOCKWAVE_CELL_SIZE):
+        self.strength = strength
+        self.height = height
+        self.cell_size = cell_size
+        self.pushed = 0
+        self.tested = 0
+
+    # rings: (n, 6) kolumny x, z, inner, outer, max_radius, scale
+    def apply(self, system, rings):
+        if len(rings) == 0:
+            return 0
+        x0 = (rings[:, 0] - rings[:, 3]).min()
+        x1 = (rings[:, 0] + rings[:, 3]).max()
+        z0 = (rings[:, 1] - rings[:, 3]).min()
+        z1 = (rings[:, 1] + rings[:, 3]).max()
+        top = GROUND_LEVEL + self.height * rings[:, 5].max()
+        idx = system.active_indices()
+        x, y, z = system.x[idx], system.y[idx], system.z[idx]
+        near = (x >= x0) & (x <= x1) & (z >= z0) & (z <= z1) & (y < top)
+        idx, x, y, z = idx[near], x[near], y[near], z[near]
+        if idx.size == 0:
+            return 0
+
+        cell = self.cell_size
+        cx = np.floor(x / cell).astype(np.int64)
+        cz = np.floor(z / cell).astype(np.int64)
+        cx0, cz0 = int(cx.min()), int(cz.min())
+        width, height = int(cx.max()) - cx0 + 1, int(cz.max()) - cz0 + 1
+        key = (cz - cz0) * width + (cx - cx0)
+        order = np.argsort(key, kind='stable')
+        counts = np.bincount(key, minlength=width * height)
+        starts = np.cumsum(counts) - counts
+
+        pushed = 0
+        for rx, rz, inner, outer, max_radius, scale in rings:
+            if outer <= inner:
+                continue
+            cols = np.arange(max(cx0, int(np.floor((rx - outer) / cell))), min(cx0 + width, int(np.floor((rx + outer) / cell)) + 1))
+            rows = np.arange(max(cz0, int(np.floor((rz - outer) / cell))), min(cz0 + height, int(np.floor((rz + outer) / cell)) + 1))
+            if cols.size == 0 or rows.size == 0:
+                continue
+            near_x, far_x = _axis_range(cols * cell - rx, cell)
+            near_z, far_z = _axis_range(rows * cell - rz, cell)
+            crossed = ((np.hypot(near_z[:, None], near_x[None, :]) < outer)
+                       & (np.hypot(far_z[:, None], far_x[None, :]) >= inner))
+            keys = ((rows - cz0)[:, None] * width + (cols - cx0)[None, :])[crossed]
+            n = counts[keys]
+            total = int(n.sum())
+            if total == 0:
+                continue
+            # Indeksy wszystkich cząstek z wybranych kubełków jednym np.repeat zamiast pętli po kubełkach.
+            candidates = order[np.repeat(starts[keys] - (np.cumsum(n) - n), n) + np.arange(total)]
+            self.tested += total
+            dx, dz = x[candidates] - rx, z[candidates] - rz
+            distance = np.hypot(dx, dz)
+            lift = (y[candidates] - GROUND_LEVEL) / (self.height * scale)
+            hit = (distance >= inner) & (distance < outer) & (distance > 0) & (lift < 1.0)
+            if not hit.any():
+                continue
+            candidates, dx, dz, distance = candidates[hit], dx[hit], dz[hit], distance[hit]
+            impulse = self.strength * scale * (1.0 - outer / max_radius) * (1.0 - np.clip(lift[hit], 0.0, 1.0))
+            target = idx[candidates]
+            system.vx[target] += (impulse * dx / distance).astype(np.float32)
+            system.vz[target] += (impulse * dz / distance).astype(np.float32)
+            pushed += target.size
+        self.pushed += pushed
+        return pushed
+
+def _axis_range(low, cell):
+    high = low + cell
+    near = np.where(low > 0, low, np.where(high < 0, -high, 0.0))
+    return near, np.maximum(np.abs(low), np.abs(high))
@@ -0,0 +1,84 @@
+import numpy as np
+from config import TERRAIN_RESOLUTION, TERRAIN_EXTENT, TERRAIN_MIN_HEIGHT
+
+# Wiersze siatki to oś z, kolumny oś x; wysokość względem GROUND_LEVEL
+class Terrain:
+    def __init__(self, resolution=TERRAIN_RESOLUTION, extent=TERRAIN_EXTENT):
+        self.resolution = resolution
+        self.extent = extent
+        self.cell = 2.0 * extent / (resolution - 1)
+        self.coords = np.linspace(-extent, extent, resolution).astype(np.float32)
+        self.heights = np.zeros((resolution, resolution), dtype=np.float32)
+        self.dirty = None
+        self.reset()
+
+    def reset(self):
+        self.heights[:] = 0.0
+        self.mark_all_dirty()
+
+    def mark_all_dirty(self):
+        self.dirty = (0, self.resolution, 0, self.resolution)
+
+    def mark_dirty(self, row0, row1, col0, col1):
+        if self.dirty is not None:
+            r0, r1, c0, c1 = self.dirty
+            row0, row1, col0, col1 = min(row0, r0), max(row1, r1), min(col0, c0), max(col1, c1)
+        self.dirty = (row0, row1, col0, col1)
+
+    def take_dirty(self):
+        dirty, self.dirty = self.dirty, None
+        return dirty
+
+    def _span(self, center, radius):
+        first = max(0, int(np.floor((center - radius + self.extent) / self.cell)))
+        last = min(self.resolution, int(np.ceil((center + radius + self.extent) / self.cell)) + 1)
+        return first, last
+
+    def carve_crater(self, x, z, radius, depth):
+        col0, col1 = self._span(x, 1.5 * radius)
+        row0, row1 = self._span(z, 1.5 * radius)
+        if col0 >= col1 or row0 >= row1:
+            return
+        dx = self.coords[col0:col1] - np.float32(x)
+        dz = self.coords[row0:row1] - np.float32(z)
+        r = np.hypot(dz[:, None], dx[None, :]) / np.float32(radius)
+        bowl = np.clip(1.0 - r * r, 0.0, None)
+        # Wał od krawędzi (r = 1) do 1.5 promienia, najwyższy w połowie.
+        rim = np.clip(1.0 - 16.0 * (r - 1.25) ** 2, 0.0, None)
+        heights = self.heights[row0:row1, col0:col1]
+        # Kolejne wybuchy pogłębiają krater, ale nie niżej niż skała (TERRAIN_MIN_HEIGHT).
+        np.maximum(heights + depth * (0.2 * rim - bowl), TERRAIN_MIN_HEIGHT, out=heights)
+        self.mark_dirty(row0, row1, col0, col1)
+
+    def deposit(self, x, z, volume):
+        fx = (np.asarray(x, dtype=np.float32) + np.float32(self.extent)) / np.float32(self.cell)
+        fz = (np.asarray(z, dtype=np.float32) + np.float32(self.extent)) / np.float32(self.cell)
+        inside = (fx >= 0) & (fx < self.resolution - 1) & (fz >= 0) & (fz < self.resolution - 1)
+        if not inside.any():
+            return
+        amount = np.broadcast_to(np.asarray(volume, dtype=np.float32), inside.shape)[inside] / np.float32(self.cell ** 2)
+        fx, fz = fx[inside], fz[inside]
+        col = fx.astype(np.int64)
+        row = fz.astype(np.int64)
+        tx, tz = fx - col, fz - row
+        row0, col0 = int(row.min()), int(col.min())
+        height = int(row.max()) - row0 + 2
+        width = int(col.max()) - col0 + 2
+        base = (row - row0) * width + (col - col0)
+        flat = np.concatenate((base, base + 1, base + width, base + width + 1))
+        weights = np.concatenate(((1 - tx) * (1 - tz), tx * (1 - tz), (1 - tx) * tz, tx * tz)) * np.tile(amount, 4)
+        added = np.bincount(flat, weights, minlength=height * width).reshape(height, width)
+        self.heights[row0:row0 + height, col0:col0 + width] += added.astype(np.float32)
+        self.mark_dirty(row0, row0 + height, col0, col0 + width)
+
+    def height_at(self, x, z):
+        limit = np.float32(self.resolution - 1.001)
+        fx = np.clip((np.asarray(x, dtype=np.float32) + np.float32(self.extent)) / np.float32(self.cell), 0, limit)
+        fz = np.clip((np.asarray(z, dtype=np.float32) + np.float32(self.extent)) / np.float32(self.cell), 0, limit)
+        col = fx.astype(np.int64)
+        row = fz.astype(np.int64)
+        tx, tz = fx - col, fz - row
+        h = self.heights
+        top = h[row, col] + (h[row, col + 1] - h[row, col]) * tx
+        bottom = h[row + 1, col] + (h[row + 1, col + 1] - h[row + 1, col]) * tx
+        return top + (bottom - top) * tz
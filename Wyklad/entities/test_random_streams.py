@@ -0,0 +1,25 @@
+import numpy as np
+from entities.random_streams import philox4x32, RandomStreams
+
+# Wektory kontrolne Philox4x32-10 z Random123 (kat_vectors): licznik, klucz, wynik
+PHILOX_KAT = [
+    ((0x00000000, 0x00000000, 0x00000000, 0x00000000), (0x00000000, 0x00000000),
+     (0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8)),
+    ((0xffffffff, 0xffffffff, 0xffffffff, 0xffffffff), (0xffffffff, 0xffffffff),
+     (0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd)),
+    ((0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344), (0xa4093822, 0x299f31d0),
+     (0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1)),
+]
+
+def test_philox_known_answers():
+    for kat_counter, key, expected in PHILOX_KAT:
+        result = philox4x32([[word] for word in kat_counter], key)
+        assert result[:, 0].tolist() == list(expected)
+
+def test_streams_do_not_depend_on_batch():
+    streams = RandomStreams(7)
+    serial = np.arange(1000)
+    whole = streams.uniforms(3, serial, 0, 6)
+    parts = np.concatenate([streams.uniforms(3, serial[i:i + 137], 0, 6) for i in range(0, 1000, 137)], axis=1)
+    assert np.array_equal(whole, parts)
+    assert whole.min() >= 0.0 and whole.max() < 1.0
@@ -0,0 +1,213 @@
+import argparse
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+import numpy as np
+from config import NUM_PARTICLES, NUM_SAND_PARTICLES, SETTINGS_FILE, DEFAULT_BOMB_VISUAL_SCALE, SMOKE_RESOLUTION
+from settings_io import read_settings
+from simulation import Simulation
+
+def write_png(filename, pixels, level=1):
+    height, width, _ = pixels.shape
+    rows = np.empty((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 0] = 0
+    rows[:, 1:] = pixels.reshape(height, width * 4)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    with open(filename, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(rows.tobytes(), level)))
+        f.write(chunk(b'IEND', b''))
+
+class FrameEncoder:
+    def __init__(self, output, frame_format='png', png_level=1, queue_size=8):
+        self.output = output
+        self.frame_format = frame_format
+        self.png_level = png_level
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.encoded = 0
+        self.encode_time = 0.0
+        self.error = None
+        if frame_format == 'png':
+            os.makedirs(output, exist_ok=True)
+            self.raw_file = None
+        else:
+            self.raw_file = open(output, 'wb')
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, index, pixels):
+        if self.error:
+            raise self.error
+        self.queue.put((index, pixels))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            index, pixels = item
+            start = time.perf_counter()
+            try:
+                if self.raw_file:
+                    self.raw_file.write(pixels.tobytes())
+                else:
+                    write_png(os.path.join(self.output, f"klatka_{index:06d}.png"), pixels, self.png_level)
+                self.encoded += 1
+            except Exception as e:
+                self.error = e
+            self.encode_time += time.perf_counter() - start
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        if self.raw_file:
+            self.raw_file.close()
+        if self.error:
+            raise self.error
+
+def export_frames(args):
+    from graphics.offscreen import select_offscreen_platform
+    select_offscreen_platform(args.gl_platform)
+    from graphics.offscreen import OffscreenContext
+    context = OffscreenContext(16, 16)
+    from OpenGL.GL import (
+        glClear, glClearColor, glEnable, glBlendFunc, glFinish,
+        GL_COLOR_BUFFER_BIT, GL_DEPTH_BUFFER_BIT, GL_STENCIL_BUFFER_BIT,
+        GL_DEPTH_TEST, GL_BLEND, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_PROGRAM_POINT_SIZE,
+    )
+    from graphics.framebuffer import FramebufferTarget, PboReadback
+    from graphics.scene import setup_camera, explosion_scene_objects, draw_scene, draw_particles
+    from graphics.scene_cache import SceneGeometryCache
+    from graphics.terrain_renderer import TerrainRenderer
+    from graphics.drawing import load_bomb_mesh
+    from graphics.particle_renderer import ParticleRenderer
+    from graphics.point_data import cloud_point_data, sand_point_data
+    from graphics.gpu_cloud import GpuCloudRenderer
+    from graphics.depth_sort import DepthSorter
+    from graphics.smoke_grid import SmokeGrid
+    from graphics.smoke_renderer import SmokeRenderer
+
+    settings = read_settings(args.settings)
+    sim = Simulation(settings, num_particles=args.particles, num_sand_particles=args.sand_particles, seed=args.seed,
+                     gpu_cloud=args.gpu_cloud)
+    if args.barrage:
+        sim.schedule_barrage(args.barrage)
+    target = FramebufferTarget(args.width, args.height)
+    readback = PboReadback(args.width, args.height, args.pbo_count)
+    encoder = FrameEncoder(args.output, args.format, args.png_level)
+    scene_cache = SceneGeometryCache()
+    bomb_mesh = load_bomb_mesh("bomb.obj")
+    cloud_renderer = GpuCloudRenderer(args.particles) if args.gpu_cloud else ParticleRenderer(args.particles)
+    sand_renderer = ParticleRenderer(args.sand_particles)
+    smoke = args.smoke and not args.gpu_cloud
+    smoke_grid = SmokeGrid(args.smoke_resolution) if smoke else None
+    smoke_renderer = SmokeRenderer(args.smoke_resolution, args.smoke_steps) if smoke else None
+    terrain_renderer = TerrainRenderer(sim.terrain)
+    sand_sorter = DepthSorter(args.sand_particles)
+    sand_sorter.set_camera(args.angle_x, args.angle_y, args.zoom)
+    bomb_visual_scale = settings.get('bomb_visual_scale', DEFAULT_BOMB_VISUAL_SCALE)
+    dt = 1.0 / args.fps
+
+    target.bind()
+    glClearColor(0.0, 0.0, 0.1, 1.0)
+    glEnable(GL_BLEND)
+    glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+    glEnable(GL_PROGRAM_POINT_SIZE)
+    render_time = 0.0
+    start = time.perf_counter()
+    for index in range(args.frames):
+        sim.step(dt)
+        frame_start = time.perf_counter()
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT | GL_STENCIL_BUFFER_BIT)
+        glEnable(GL_DEPTH_TEST)
+        setup_camera(args.angle_x, args.angle_y, args.zoom, args.width, args.height)
+        craters, bombs, shockwaves = explosion_scene_objects(sim)
+        terrain_renderer.update()
+        draw_scene(scene_cache, bomb_mesh, craters, bombs, shockwaves, bomb_visual_scale,
+                   terrain_renderer=terrain_renderer)
+        if craters:
+            if args.gpu_cloud:
+                for launch in sim.cloud_launches:
+                    cloud_renderer.launch(launch)
+                sim.cloud_launches.clear()
+                cloud_renderer.draw(sim.time, sim.params)
+            elif smoke:
+                cloud = sim.cloud
+                idx = cloud.active_indices()
+                smoke_grid.splat(np.column_stack((cloud.x[idx], cloud.y[idx], cloud.z[idx])))
+            else:
+                cloud_renderer.upload(*cloud_point_data(sim.cloud))
+            sand_renderer.upload(*sand_point_data(sim.sand, sand_sorter.sort(sim.sand, sim.sand.active_indices())))
+            draw_particles(None if args.gpu_cloud else cloud_renderer, sand_renderer, smoke_renderer, smoke_grid)
+        ready = readback.read(index)
+        render_time += time.perf_counter() - frame_start
+        if ready is not None:
+            encoder.submit(*ready)
+    for ready in readback.flush():
+        encoder.submit(*ready)
+    glFinish()
+    encoder.close()
+    elapsed = time.perf_counter() - start
+
+    readback.delete()
+    target.unbind()
+    target.delete()
+    scene_cache.delete()
+    terrain_renderer.delete()
+    if bomb_mesh is not None:
+        bomb_mesh.delete()
+    cloud_renderer.delete()
+    sand_renderer.delete()
+    if smoke_renderer:
+        smoke_renderer.delete()
+    context.destroy()
+
+    print(f"Zapisano {encoder.encoded} klatek {args.width}x{args.height} ({args.format}) do {args.output}")
+    print(f"Razem: {elapsed:.2f} s, {encoder.encoded / max(elapsed, 1e-9):.1f} kl./s "
+          f"(rysowanie i odczyt {args.frames / max(render_time, 1e-9):.1f} kl./s, kodowanie {encoder.encoded / max(encoder.encode_time, 1e-9):.1f} kl./s)")
+    if args.format == 'raw':
+        print(f"Odtworzenie: ffmpeg -f rawvideo -pix_fmt rgba -s {args.width}x{args.height} -r {args.fps:g} -i {args.output} film.mp4")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Renderowanie symulacji do plików bez okna (FBO + odczyt przez PBO).")
+    parser.add_argument('--output', default='klatki', help="Katalog na PNG albo plik dla formatu raw.")
+    parser.add_argument('--format', choices=['png', 'raw'], default='png')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--fps', type=float, default=60.0, help="Czas symulacji na klatkę to 1/fps.")
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--settings', default=SETTINGS_FILE)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--particles', type=int, default=NUM_PARTICLES)
+    parser.add_argument('--sand-particles', type=int, default=NUM_SAND_PARTICLES)
+    parser.add_argument('--barrage', type=int, default=0)
+    parser.add_argument('--angle-x', type=float, default=15.0)
+    parser.add_argument('--angle-y', type=float, default=30.0)
+    parser.add_argument('--zoom', type=float, default=-8.0)
+    parser.add_argument('--pbo-count', type=int, default=2, help="Liczba PBO używanych na zmianę.")
+    parser.add_argument('--png-level', type=int, default=1, help="Poziom kompresji zlib dla PNG (0-9).")
+    parser.add_argument('--gpu-cloud', action='store_true', help="Ruch chmury liczony w shaderze (fale uderzeniowe nie pchają wtedy chmury).")
+    parser.add_argument('--smoke', action='store_true', help="Chmura jako objętość (siatka gęstości i marsz promienia).")
+    parser.add_argument('--smoke-resolution', type=int, default=SMOKE_RESOLUTION, help="Woksele siatki dymu na oś.")
+    parser.add_argument('--smoke-steps', type=int, default=None, help="Próbki na promień (domyślnie rozdzielczość siatki).")
+    parser.add_argument('--gl-platform', choices=['egl', 'osmesa'], default='egl')
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.frames < 1:
+        parser.error("--frames musi być co najmniej 1")
+    return export_frames(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
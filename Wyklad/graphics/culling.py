@@ -0,0 +1,63 @@
+import math
+import numpy as np
+
+def perspective_matrix(fov_y, aspect, near, far):
+    f = 1.0 / math.tan(math.radians(fov_y) / 2)
+    return np.array([
+        [f / aspect, 0, 0, 0],
+        [0, f, 0, 0],
+        [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+        [0, 0, -1, 0],
+    ], dtype=np.float64)
+
+# Ta sama macierz co glTranslatef i dwa glRotatef w setup_camera
+def camera_view_matrix(angle_x, angle_y, camera_zoom, eye_height=-0.6):
+    translate = np.identity(4)
+    translate[:3, 3] = (0.0, eye_height, camera_zoom)
+    ax, ay = math.radians(angle_x), math.radians(angle_y)
+    rotate_x = np.array([[1, 0, 0, 0], [0, math.cos(ax), -math.sin(ax), 0], [0, math.sin(ax), math.cos(ax), 0], [0, 0, 0, 1]])
+    rotate_y = np.array([[math.cos(ay), 0, math.sin(ay), 0], [0, 1, 0, 0], [-math.sin(ay), 0, math.cos(ay), 0], [0, 0, 0, 1]])
+    return translate @ rotate_x @ rotate_y
+
+class FrustumCuller:
+    def __init__(self, fov_y=45.0, near=0.1, far=50.0, max_distance=None, max_point_size=40.0):
+        self.fov_y = fov_y
+        self.near = near
+        self.far = far
+        self.max_distance = far if max_distance is None else max_distance
+        self.max_point_size = max_point_size
+        self.enabled = True
+        self.matrix = np.identity(4, dtype=np.float32)
+        self.margin = (0.0, 0.0)
+        self.tested = 0
+        self.culled = 0
+
+    def set_camera(self, angle_x, angle_y, camera_zoom, viewport_width, viewport_height):
+        aspect = viewport_width / float(viewport_height)
+        projection = perspective_matrix(self.fov_y, aspect, self.near, self.far)
+        self.matrix = (projection @ camera_view_matrix(angle_x, angle_y, camera_zoom)).astype(np.float32)
+        self.margin = (self.max_point_size / viewport_width, self.max_point_size / viewport_height)
+        self.tested = 0
+        self.culled = 0
+
+    def visible_indices(self, system, idx=None, alpha=1.0):
+        if idx is None:
+            idx = system.active_indices()
+        if not self.enabled or idx.size == 0:
+            return idx
+        if alpha < 1.0:
+            x, y, z = system.interpolated_positions(alpha, idx).T
+        else:
+            x, y, z = system.x[idx], system.y[idx], system.z[idx]
+        m = self.matrix
+        w = m[3, 0] * x + m[3, 1] * y + m[3, 2] * z + m[3, 3]
+        # w w układzie gluPerspective to odległość od kamery wzdłuż osi widzenia.
+        visible = (w > self.near) & (w < self.max_distance)
+        clip_x = m[0, 0] * x + m[0, 1] * y + m[0, 2] * z + m[0, 3]
+        visible &= np.abs(clip_x) <= w * (1.0 + self.margin[0])
+        clip_y = m[1, 0] * x + m[1, 1] * y + m[1, 2] * z + m[1, 3]
+        visible &= np.abs(clip_y) <= w * (1.0 + self.margin[1])
+        kept = idx[visible]
+        self.tested += idx.size
+        self.culled += idx.size - kept.size
+        return kept
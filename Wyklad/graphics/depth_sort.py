@@ -0,0 +1,52 @@
+import numpy as np
+from graphics.culling import camera_view_matrix
+
+# Sortowanie zaczyna od poprzedniej permutacji (timsort na prawie posortowanych danych)
+class DepthSorter:
+    def __init__(self, capacity, threshold=0.01):
+        self.threshold = threshold
+        self.depth = np.zeros(capacity, dtype=np.float32)
+        self.mark = np.zeros(capacity, dtype=bool)
+        self.order = np.empty(0, dtype=np.int64)
+        self.members = self.order
+        self.view = None
+        self.camera_moved = True
+        self.sorted = 0
+        self.skipped = 0
+
+    def set_camera(self, angle_x, angle_y, camera_zoom):
+        # Wystarczy trzeci wiersz macierzy widoku: z w układzie kamery, dalsze cząstki mają mniejsze z.
+        view = camera_view_matrix(angle_x, angle_y, camera_zoom)[2].astype(np.float32)
+        self.camera_moved = self.view is None or not np.array_equal(view, self.view)
+        self.view = view
+
+    def _depth(self, x, y, z):
+        v = self.view
+        return v[0] * x + v[1] * y + v[2] * z + v[3]
+
+    def sort_points(self, positions):
+        positions = np.asarray(positions, dtype=np.float32)
+        self.sorted += 1
+        return np.argsort(self._depth(positions[:, 0], positions[:, 1], positions[:, 2]), kind='stable')
+
+    def sort(self, system, idx, alpha=1.0):
+        if alpha < 1.0:
+            depth = self._depth(*system.interpolated_positions(alpha, idx).T)
+        else:
+            depth = self._depth(system.x[idx], system.y[idx], system.z[idx])
+        if (not self.camera_moved and np.array_equal(idx, self.members)
+                and (idx.size == 0 or np.abs(depth - self.depth[idx]).max() < self.threshold)):
+            self.skipped += 1
+            return self.order
+        # Poprzednia kolejność bez cząstek, których już nie ma, a nowe na końcu.
+        mark = self.mark
+        mark[idx] = True
+        kept = self.order[mark[self.order]]
+        mark[kept] = False
+        candidate = np.concatenate((kept, idx[mark[idx]]))
+        mark[idx] = False
+        self.depth[idx] = depth
+        self.order = candidate[np.argsort(self.depth[candidate], kind='stable')]
+        self.members = idx.copy()
+        self.sorted += 1
+        return self.order
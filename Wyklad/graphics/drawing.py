@@ -2,6 +2,8 @@ from OpenGL.GL import *
 from OpenGL.GLU import *
 import math
 from config import GROUND_LEVEL
+from graphics.mesh_data import load_mesh_data
+from graphics.mesh import Mesh
 
 def draw_crater(depth=0.3, radius=0.6, segments=32, center_x=0.0, center_z=0.0):
     bottom_color = (0.0, 0.0, 0.0)
@@ -41,7 +43,7 @@ def draw_crater(depth=0.3, radius=0.6, segments=32, center_x=0.0, center_z=0.0):
         glVertex3f(ex, ey, ez)
     glEnd()
 
-def draw_ground(crater_present=False, crater_radius=0.6, crater_center_x=0.0, crater_center_z=0.0, extent=10.0):
+def draw_ground(crater_present=False, crater_radius=0.6, crater_center_x=0.0, crater_center_z=0.0, extent=10.0, extra_craters=()):
     y_level = GROUND_LEVEL - 0.01
     glColor3f(0.94, 0.86, 0.6)
 
@@ -60,13 +62,14 @@ def draw_ground(crater_present=False, crater_radius=0.6, crater_center_x=0.0, cr
         glColorMask(GL_FALSE, GL_FALSE, GL_FALSE, GL_FALSE)
         glDepthMask(GL_FALSE)
 
-        glPushMatrix()
-        glTranslatef(crater_center_x, y_level, crater_center_z) 
-        glRotatef(-90, 1, 0, 0)
         quad = gluNewQuadric()
-        gluDisk(quad, 0, crater_radius, 32, 1) 
+        for radius, center_x, center_z in ((crater_radius, crater_center_x, crater_center_z),) + tuple(extra_craters):
+            glPushMatrix()
+            glTranslatef(center_x, y_level, center_z) 
+            glRotatef(-90, 1, 0, 0)
+            gluDisk(quad, 0, radius, 32, 1) 
+            glPopMatrix()
         gluDeleteQuadric(quad)
-        glPopMatrix()
 
         glColorMask(GL_TRUE, GL_TRUE, GL_TRUE, GL_TRUE)
         glDepthMask(GL_TRUE)
@@ -105,3 +108,49 @@ def draw_background_sides():
     glVertex3f(size, height, size)
     glVertex3f(size, height, -size)
     glEnd()
+
+def load_bomb_mesh(filename="bomb.obj"):
+    mesh_data = load_mesh_data(filename)
+    if mesh_data is None or len(mesh_data[2]) == 0:
+        print("Nie udało się wczytać modelu bomby. Używanie domyślnego punktu.")
+        return None
+    return Mesh(*mesh_data)
+
+def draw_bomb(bomb, mesh, scale=1.0, position=None):
+    if bomb.exploded:
+        return
+    if position is None:
+        position = (bomb.x, bomb.y, bomb.z)
+    glPushMatrix()
+    glTranslatef(*position)
+    glRotatef(180, 1, 0, 0)
+    glScalef(scale, scale, scale)
+    if mesh is not None:
+        glColor3f(0.2, 0.2, 0.2)
+        mesh.draw()
+    else:
+        glColor3f(1.0, 0.3, 0.0)
+        glPointSize(24 * scale)
+        glBegin(GL_POINTS)
+        glVertex3f(0,0,0)
+        glEnd()
+    glPopMatrix()
+
+def draw_unit_circle(segments=64):
+    glBegin(GL_LINE_LOOP)
+    for i in range(segments):
+        angle = 2 * math.pi * i / segments
+        glVertex3f(math.cos(angle), 0.0, math.sin(angle))
+    glEnd()
+
+def draw_shockwave(shockwave, radius=None, segments=64, draw_ring=draw_unit_circle):
+    if not shockwave.active:
+        return
+    if radius is None:
+        radius = shockwave.radius
+    glColor4f(0.8, 0.8, 0.8, 0.5) 
+    glPushMatrix()
+    glTranslatef(shockwave.x, GROUND_LEVEL, shockwave.z)
+    glScalef(radius, 1.0, radius)
+    draw_ring(segments)
+    glPopMatrix()
@@ -0,0 +1,79 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+class FramebufferTarget:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.fbo = glGenFramebuffers(1)
+        self.color_rbo, self.depth_rbo = glGenRenderbuffers(2)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.color_rbo)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, self.depth_rbo)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH24_STENCIL8, width, height)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, self.color_rbo)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_STENCIL_ATTACHMENT, GL_RENDERBUFFER, self.depth_rbo)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            self.delete()
+            raise RuntimeError(f"Niekompletny framebuffer (status 0x{status:x})")
+
+    def bind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def unbind(self):
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+    def delete(self):
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteRenderbuffers(2, [self.color_rbo, self.depth_rbo])
+
+# Kilka PBO na zmianę: mapowany jest najstarszy, który GPU zdążyło już wypełnić
+class PboReadback:
+    def __init__(self, width, height, count=2):
+        self.width = width
+        self.height = height
+        self.frame_bytes = width * height * 4
+        self.pbos = list(np.atleast_1d(glGenBuffers(count)))
+        for pbo in self.pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self.frame_bytes, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pending = []
+        self.next = 0
+
+    def read(self, tag=None):
+        pbo = self.pbos[self.next]
+        self.next = (self.next + 1) % len(self.pbos)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glReadPixels(0, 0, self.width, self.height, GL_RGBA, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self.pending.append((pbo, tag))
+        if len(self.pending) == len(self.pbos):
+            return self._map(*self.pending.pop(0))
+        return None
+
+    def flush(self):
+        results = [self._map(pbo, tag) for pbo, tag in self.pending]
+        self.pending = []
+        return results
+
+    def _map(self, pbo, tag):
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        address = glMapBuffer(GL_PIXEL_PACK_BUFFER, GL_READ_ONLY)
+        pixels = np.empty((self.height, self.width, 4), dtype=np.uint8)
+        ctypes.memmove(pixels.ctypes.data, address, self.frame_bytes)
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        # OpenGL zaczyna od dolnego wiersza.
+        return tag, pixels[::-1]
+
+    def delete(self):
+        glDeleteBuffers(len(self.pbos), self.pbos)
+        self.pbos = []
@@ -0,0 +1,111 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+from config import GROUND_LEVEL
+from entities.cloud_trajectory import LAUNCH_COLUMNS, STEM_DECELERATION, STEM_END_SPEED
+from physics_params import compile_params
+
+CLOUD_VERTEX_SHADER = """
+#version 120
+attribute vec4 origin;
+attribute vec4 stem;
+attribute vec4 cloud;
+uniform float time;
+uniform float ground;
+uniform float cloud_gravity;
+uniform float air_resistance;
+varying vec4 v_color;
+void main() {
+    float scale = origin.w;
+    float age = time - origin.z;
+    float deceleration = %(deceleration)r * scale;
+    float stem_time = max((stem.y - %(end_speed)r * scale) / deceleration, 0.0);
+    float e = clamp(age, 0.0, stem_time);
+    vec3 p = vec3(origin.x + stem.x * e, ground + stem.y * e - 0.5 * deceleration * e * e, origin.y + stem.z * e);
+    float tau = max(age - stem_time, 0.0);
+    float drift = air_resistance > 1e-6 ? (1.0 - exp(-air_resistance * tau)) / air_resistance : tau;
+    p += vec3(cloud.x * drift, cloud.y * tau - 0.5 * cloud_gravity * scale * tau * tau, cloud.z * drift);
+    if (age < 0.0 || age >= cloud.w || p.y < ground - 0.2) {
+        // Martwa cząstka: poza bryłą obcinania, więc nie zostanie narysowana.
+        gl_Position = vec4(2.0, 2.0, 2.0, 1.0);
+        gl_PointSize = 1.0;
+        v_color = vec4(0.0);
+        return;
+    }
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(p, 1.0);
+    gl_PointSize = clamp(stem.w * sqrt(scale), 1.0, 40.0);
+    float shade = age > stem_time ? 0.5 : 0.6;
+    v_color = vec4(shade, shade, shade, 1.0);
+}
+""" % {'deceleration': STEM_DECELERATION, 'end_speed': STEM_END_SPEED}
+
+CLOUD_FRAGMENT_SHADER = """
+#version 120
+varying vec4 v_color;
+void main() {
+    gl_FragColor = v_color;
+}
+"""
+
+LAUNCH_STRIDE = len(LAUNCH_COLUMNS) * 4
+
+# Bufor pierścieniowy parametrów startowych: przy braku miejsca nadpisywane są najstarsze cząstki
+class GpuCloudRenderer:
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.program = shaders.compileProgram(
+            shaders.compileShader(CLOUD_VERTEX_SHADER, GL_VERTEX_SHADER),
+            shaders.compileShader(CLOUD_FRAGMENT_SHADER, GL_FRAGMENT_SHADER),
+        )
+        self.attributes = [glGetAttribLocation(self.program, name) for name in ('origin', 'stem', 'cloud')]
+        self.uniforms = {name: glGetUniformLocation(self.program, name)
+                         for name in ('time', 'ground', 'cloud_gravity', 'air_resistance')}
+        self.vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        glBufferData(GL_ARRAY_BUFFER, capacity * LAUNCH_STRIDE, None, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.params_version = None
+        self.clear()
+
+    def clear(self):
+        self.cursor = 0
+        self.count = 0
+
+    def launch(self, launch):
+        launch = np.ascontiguousarray(launch[-self.capacity:], dtype=np.float32)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        first = min(len(launch), self.capacity - self.cursor)
+        glBufferSubData(GL_ARRAY_BUFFER, self.cursor * LAUNCH_STRIDE, first * LAUNCH_STRIDE, launch[:first])
+        if first < len(launch):
+            glBufferSubData(GL_ARRAY_BUFFER, 0, (len(launch) - first) * LAUNCH_STRIDE, launch[first:])
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.cursor = (self.cursor + len(launch)) % self.capacity
+        self.count = min(self.capacity, self.count + len(launch))
+
+    def draw(self, time, params=None):
+        if self.count == 0:
+            return
+        params = compile_params(params)
+        glUseProgram(self.program)
+        glUniform1f(self.uniforms['time'], time)
+        # Uniformy zostają w programie, więc parametry fizyki są wysyłane tylko po zmianie bloku.
+        if params.version != self.params_version:
+            self.params_version = params.version
+            glUniform1f(self.uniforms['ground'], GROUND_LEVEL)
+            glUniform1f(self.uniforms['cloud_gravity'], params.cloud_gravity)
+            glUniform1f(self.uniforms['air_resistance'], params.cloud_air_resistance)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+        for i, loc in enumerate(self.attributes):
+            glEnableVertexAttribArray(loc)
+            glVertexAttribPointer(loc, 4, GL_FLOAT, GL_FALSE, LAUNCH_STRIDE, ctypes.c_void_p(16 * i))
+        glDrawArrays(GL_POINTS, 0, self.count)
+        for loc in self.attributes:
+            glDisableVertexAttribArray(loc)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+
+    def delete(self):
+        glDeleteBuffers(1, [self.vbo])
+        glDeleteProgram(self.program)
+        self.count = 0
@@ -0,0 +1,109 @@
+import zlib
+import pygame
+from OpenGL.GL import *
+
+MAX_DIRTY_RECTS = 8
+
+class SurfaceOverlay:
+    def __init__(self, region, background=(0, 0, 0, 0)):
+        self.region = pygame.Rect(region)
+        self.background = background
+        self.surface = pygame.Surface(self.region.size, pygame.SRCALPHA)
+        self.surface.fill(background)
+        self.texture_id = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, self.region.width, self.region.height, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self.dirty_rects = [self.surface.get_rect()]
+        self.uploaded_bytes = 0
+
+    def mark_dirty(self, rect=None):
+        rect = self.surface.get_rect() if rect is None else pygame.Rect(rect).clip(self.surface.get_rect())
+        if rect.width > 0 and rect.height > 0:
+            self.dirty_rects.append(rect)
+
+    def _merged_dirty_rects(self):
+        rects = []
+        for rect in self.dirty_rects:
+            index = rect.collidelist(rects)
+            while index != -1:
+                rect = rect.union(rects.pop(index))
+                index = rect.collidelist(rects)
+            rects.append(rect)
+        if len(rects) > MAX_DIRTY_RECTS:
+            rects = [rects[0].unionall(rects[1:])]
+        return rects
+
+    def upload(self):
+        self.uploaded_bytes = 0
+        if not self.dirty_rects:
+            return
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        for rect in self._merged_dirty_rects():
+            pixels = pygame.image.tobytes(self.surface.subsurface(rect), "RGBA")
+            glTexSubImage2D(GL_TEXTURE_2D, 0, rect.x, rect.y, rect.width, rect.height, GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+            self.uploaded_bytes += len(pixels)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self.dirty_rects = []
+
+    def draw(self):
+        x0, y0 = self.region.topleft
+        x1, y1 = self.region.bottomright
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.texture_id)
+        glColor4f(1.0, 1.0, 1.0, 1.0)
+        glBegin(GL_QUADS)
+        glTexCoord2f(0, 0); glVertex2f(x0, y0)
+        glTexCoord2f(1, 0); glVertex2f(x1, y0)
+        glTexCoord2f(1, 1); glVertex2f(x1, y1)
+        glTexCoord2f(0, 1); glVertex2f(x0, y1)
+        glEnd()
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_TEXTURE_2D)
+
+    def delete(self):
+        glDeleteTextures([self.texture_id])
+
+class GuiOverlay(SurfaceOverlay):
+    def __init__(self, manager, region, background=(50, 50, 70, 255)):
+        super().__init__(region, background)
+        self.manager = manager
+        self._previous = {}
+
+    def _visible_sprites(self):
+        return [sprite for sprite in self.manager.get_sprite_group().sprites()
+                if sprite.visible and sprite.image is not None]
+
+    def _collect_dirty_rects(self, sprites):
+        # Obraz porównujemy po sumie kontrolnej pikseli, bo pygame_gui potrafi rysować w tej samej powierzchni
+        current = {sprite: (tuple(sprite.rect), zlib.crc32(sprite.image.get_view('1'))) for sprite in sprites}
+        offset_x, offset_y = -self.region.x, -self.region.y
+        for sprite, state in current.items():
+            previous = self._previous.get(sprite)
+            if previous != state:
+                self.mark_dirty(pygame.Rect(state[0]).move(offset_x, offset_y))
+                if previous:
+                    self.mark_dirty(pygame.Rect(previous[0]).move(offset_x, offset_y))
+        for sprite, state in self._previous.items():
+            if sprite not in current:
+                self.mark_dirty(pygame.Rect(state[0]).move(offset_x, offset_y))
+        self._previous = current
+
+    def render(self):
+        sprites = self._visible_sprites()
+        self._collect_dirty_rects(sprites)
+        if not self.dirty_rects:
+            return False
+        offset = (-self.region.x, -self.region.y)
+        for rect in self._merged_dirty_rects():
+            self.surface.set_clip(rect)
+            self.surface.fill(self.background, rect)
+            for sprite in sprites:
+                self.surface.blit(sprite.image, sprite.rect.move(offset), None, sprite.blendmode)
+        self.surface.set_clip(None)
+        return True
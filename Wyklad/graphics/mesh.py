@@ -0,0 +1,33 @@
+import numpy as np
+from OpenGL.GL import *
+
+class Mesh:
+    def __init__(self, vertices, normals, indices):
+        self.index_count = int(indices.size)
+        self.vertex_vbo, self.normal_vbo, self.index_ibo = glGenBuffers(3)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_vbo)
+        glBufferData(GL_ARRAY_BUFFER, np.ascontiguousarray(vertices, dtype=np.float32), GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, self.normal_vbo)
+        glBufferData(GL_ARRAY_BUFFER, np.ascontiguousarray(normals, dtype=np.float32), GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, np.ascontiguousarray(indices, dtype=np.uint32), GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def draw(self):
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_vbo)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, self.normal_vbo)
+        glNormalPointer(GL_FLOAT, 0, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_ibo)
+        glDrawElements(GL_TRIANGLES, self.index_count, GL_UNSIGNED_INT, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        glDeleteBuffers(3, [self.vertex_vbo, self.normal_vbo, self.index_ibo])
+        self.index_count = 0
@@ -0,0 +1,101 @@
+import hashlib
+import os
+import numpy as np
+
+CACHE_SUFFIX = ".cache.npz"
+CACHE_VERSION = 1
+
+_loaded_meshes = {}
+
+def parse_obj(filename):
+    vertices = []
+    triangles = []
+    with open(filename, 'r') as f:
+        for line in f:
+            line = line.split('#')[0].strip()
+            if not line:
+                continue
+            if line.startswith('v '):
+                parts = line.split()
+                vertices.append((float(parts[1]), float(parts[2]), float(parts[3])))
+            elif line.startswith('f '):
+                parts = line.split()
+                face = [int(p.split('/')[0]) for p in parts[1:]]
+                face = [i - 1 if i > 0 else len(vertices) + i for i in face]
+                for k in range(1, len(face) - 1):
+                    triangles.append((face[0], face[k], face[k + 1]))
+    vertices = np.array(vertices, dtype=np.float32).reshape(-1, 3)
+    indices = np.array(triangles, dtype=np.int64).reshape(-1, 3)
+    valid = np.all((indices >= 0) & (indices < len(vertices)), axis=1)
+    return vertices, indices[valid].astype(np.uint32)
+
+def compute_normals(vertices, indices):
+    normals = np.zeros_like(vertices)
+    if len(indices) == 0:
+        return normals
+    v0 = vertices[indices[:, 0]]
+    v1 = vertices[indices[:, 1]]
+    v2 = vertices[indices[:, 2]]
+    face_normals = np.cross(v1 - v0, v2 - v0)
+    for corner in range(3):
+        np.add.at(normals, indices[:, corner], face_normals)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
+
+def _file_digest(filename):
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_cache(cache_file, stat, filename):
+    try:
+        with np.load(cache_file) as cache:
+            if int(cache['version']) != CACHE_VERSION:
+                return None
+            fresh = int(cache['mtime_ns']) == stat.st_mtime_ns and int(cache['size']) == stat.st_size
+            digest = None
+            if not fresh:
+                digest = _file_digest(filename)
+                if str(cache['sha1']) != digest:
+                    return None
+            data = cache['vertices'], cache['normals'], cache['indices']
+    except (OSError, KeyError, ValueError):
+        return None
+    if digest is not None:
+        # Treść bez zmian, tylko nowy czas modyfikacji: zapis nowego mtime_ns, żeby nie liczyć sha1 przy każdym starcie.
+        _write_cache(cache_file, stat, filename, *data, digest=digest)
+    return data
+
+def _write_cache(cache_file, stat, filename, vertices, normals, indices, digest=None):
+    try:
+        with open(cache_file, 'wb') as f:
+            np.savez(f, version=CACHE_VERSION, mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                     sha1=digest or _file_digest(filename), vertices=vertices, normals=normals, indices=indices)
+    except OSError as e:
+        print(f"Nie udało się zapisać pamięci podręcznej modelu {cache_file}: {e}")
+
+def load_mesh_data(filename):
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        print(f"Błąd: Nie znaleziono pliku {filename}")
+        return None
+    key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+    if key in _loaded_meshes:
+        return _loaded_meshes[key]
+    cache_file = filename + CACHE_SUFFIX
+    data = _read_cache(cache_file, stat, filename)
+    if data is None:
+        try:
+            vertices, indices = parse_obj(filename)
+        except Exception as e:
+            print(f"Błąd podczas wczytywania pliku {filename}: {e}")
+            return None
+        normals = compute_normals(vertices, indices)
+        _write_cache(cache_file, stat, filename, vertices, normals, indices)
+        data = (vertices, normals, indices)
+    _loaded_meshes[key] = data
+    return data
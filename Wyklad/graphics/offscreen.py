@@ -0,0 +1,63 @@
+import ctypes
+import os
+
+# Przed pierwszym importem OpenGL
+def select_offscreen_platform(platform='egl'):
+    os.environ.setdefault('PYOPENGL_PLATFORM', platform)
+    if not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'):
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+    return os.environ['PYOPENGL_PLATFORM']
+
+class OffscreenContext:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.platform = os.environ.get('PYOPENGL_PLATFORM', 'egl')
+        if self.platform == 'osmesa':
+            self._create_osmesa()
+        else:
+            self._create_egl()
+
+    def _create_egl(self):
+        from OpenGL import EGL
+        self._egl = EGL
+        self.display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        if not EGL.eglInitialize(self.display, None, None):
+            raise RuntimeError("Nie udało się zainicjować EGL")
+        attributes = (EGL.EGLint * 13)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_ALPHA_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24, EGL.EGL_STENCIL_SIZE, 8,
+            EGL.EGL_NONE,
+        )
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        if not EGL.eglChooseConfig(self.display, attributes, ctypes.pointer(config), 1, ctypes.pointer(count)) or count.value == 0:
+            raise RuntimeError("Brak konfiguracji EGL z obsługą OpenGL")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        surface_attributes = (EGL.EGLint * 5)(EGL.EGL_WIDTH, self.width, EGL.EGL_HEIGHT, self.height, EGL.EGL_NONE)
+        self.surface = EGL.eglCreatePbufferSurface(self.display, config, surface_attributes)
+        self.context = EGL.eglCreateContext(self.display, config, EGL.EGL_NO_CONTEXT, None)
+        if not EGL.eglMakeCurrent(self.display, self.surface, self.surface, self.context):
+            raise RuntimeError("Nie udało się aktywować kontekstu EGL")
+
+    def _create_osmesa(self):
+        from OpenGL import GL, arrays, osmesa
+        self._osmesa = osmesa
+        self.context = osmesa.OSMesaCreateContextExt(osmesa.OSMESA_RGBA, 24, 8, 0, None)
+        if not self.context:
+            raise RuntimeError("Nie udało się utworzyć kontekstu OSMesa")
+        self.buffer = arrays.GLubyteArray.zeros((self.height, self.width, 4))
+        if not osmesa.OSMesaMakeCurrent(self.context, self.buffer, GL.GL_UNSIGNED_BYTE, self.width, self.height):
+            raise RuntimeError("Nie udało się aktywować kontekstu OSMesa")
+
+    def destroy(self):
+        if self.platform == 'osmesa':
+            self._osmesa.OSMesaDestroyContext(self.context)
+        else:
+            EGL = self._egl
+            EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroySurface(self.display, self.surface)
+            EGL.eglDestroyContext(self.display, self.context)
+            EGL.eglTerminate(self.display)
@@ -0,0 +1,92 @@
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+
+POINT_VERTEX_SHADER = """
+#version 120
+attribute vec3 position;
+attribute vec4 color;
+attribute float point_size;
+varying vec4 v_color;
+void main() {
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(position, 1.0);
+    gl_PointSize = point_size;
+    v_color = color;
+}
+"""
+
+POINT_FRAGMENT_SHADER = """
+#version 120
+varying vec4 v_color;
+void main() {
+    gl_FragColor = v_color;
+}
+"""
+
+_point_program = None
+
+def get_point_program():
+    global _point_program
+    if _point_program is None:
+        _point_program = shaders.compileProgram(
+            shaders.compileShader(POINT_VERTEX_SHADER, GL_VERTEX_SHADER),
+            shaders.compileShader(POINT_FRAGMENT_SHADER, GL_FRAGMENT_SHADER),
+        )
+    return _point_program
+
+class ParticleRenderer:
+    def __init__(self, capacity=1024):
+        self.program = get_point_program()
+        self.position_loc = glGetAttribLocation(self.program, "position")
+        self.color_loc = glGetAttribLocation(self.program, "color")
+        self.size_loc = glGetAttribLocation(self.program, "point_size")
+        self.position_vbo, self.color_vbo, self.size_vbo = glGenBuffers(3)
+        self.capacity = 0
+        self.count = 0
+        self._reserve(capacity)
+
+    def _reserve(self, capacity):
+        if capacity <= self.capacity:
+            return
+        self.capacity = max(capacity, 2 * self.capacity)
+        for vbo, components in ((self.position_vbo, 3), (self.color_vbo, 4), (self.size_vbo, 1)):
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, self.capacity * components * 4, None, GL_STREAM_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def upload(self, positions, colors, sizes):
+        n = len(sizes)
+        self._reserve(n)
+        self.count = n
+        if n == 0:
+            return
+        for vbo, data, components in ((self.position_vbo, positions, 3), (self.color_vbo, colors, 4), (self.size_vbo, sizes, 1)):
+            data = np.ascontiguousarray(data, dtype=np.float32)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            # Osierocenie bufora: sterownik nie czeka, aż GPU skończy rysować poprzednią klatkę.
+            glBufferData(GL_ARRAY_BUFFER, self.capacity * components * 4, None, GL_STREAM_DRAW)
+            glBufferSubData(GL_ARRAY_BUFFER, 0, data.nbytes, data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    # depth_write=False: ziarna nie zasłaniają się nawzajem w buforze głębi
+    def draw(self, depth_write=True):
+        if self.count == 0:
+            return
+        glDepthMask(GL_TRUE if depth_write else GL_FALSE)
+        glUseProgram(self.program)
+        for vbo, loc, components in ((self.position_vbo, self.position_loc, 3), (self.color_vbo, self.color_loc, 4), (self.size_vbo, self.size_loc, 1)):
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glEnableVertexAttribArray(loc)
+            glVertexAttribPointer(loc, components, GL_FLOAT, GL_FALSE, 0, ctypes.c_void_p(0))
+        glDrawArrays(GL_POINTS, 0, self.count)
+        for loc in (self.position_loc, self.color_loc, self.size_loc):
+            glDisableVertexAttribArray(loc)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+        glDepthMask(GL_TRUE)
+
+    def delete(self):
+        glDeleteBuffers(3, [self.position_vbo, self.color_vbo, self.size_vbo])
+        self.capacity = 0
+        self.count = 0
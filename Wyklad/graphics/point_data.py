@@ -0,0 +1,27 @@
+import numpy as np
+from entities.cloud_system import PHASE_STEM
+
+def cloud_point_data(cloud, idx=None, alpha=1.0):
+    if idx is None:
+        idx = cloud.active_indices()
+    if alpha < 1.0:
+        positions = cloud.interpolated_positions(alpha, idx)
+    else:
+        positions = np.column_stack((cloud.x[idx], cloud.y[idx], cloud.z[idx]))
+    colors = np.ones((idx.size, 4), dtype=np.float32)
+    colors[:, :3] = np.where(cloud.phase[idx] == PHASE_STEM, 0.6, 0.5)[:, None]
+    sizes = np.clip(cloud.size[idx] * np.sqrt(cloud.scale[idx]), 1.0, 40.0)
+    return positions, colors, sizes
+
+def sand_point_data(sand, idx=None, alpha=1.0):
+    if idx is None:
+        idx = sand.active_indices()
+    if alpha < 1.0:
+        positions = sand.interpolated_positions(alpha, idx)
+    else:
+        positions = np.column_stack((sand.x[idx], sand.y[idx], sand.z[idx]))
+    colors = np.empty((idx.size, 4), dtype=np.float32)
+    colors[:, :3] = sand.color[idx]
+    colors[:, 3] = np.clip(sand.life[idx] * 2.0, 0.0, 1.0)
+    sizes = sand.size[idx] * np.sqrt(sand.scale[idx])
+    return positions, colors, sizes
@@ -0,0 +1,46 @@
+from OpenGL.GL import *
+from OpenGL.GLU import *
+from graphics.drawing import draw_bomb, draw_shockwave
+
+def setup_camera(angle_x, angle_y, camera_zoom, width, height):
+    glViewport(0, 0, width, height)
+    glMatrixMode(GL_PROJECTION); glLoadIdentity()
+    gluPerspective(45, (width / float(height)), 0.1, 50.0)
+    glMatrixMode(GL_MODELVIEW); glLoadIdentity()
+    glTranslatef(0.0, -0.6, camera_zoom)
+    glRotatef(angle_x, 1, 0, 0); glRotatef(angle_y, 0, 1, 0)
+
+def explosion_scene_objects(sim, alpha=1.0):
+    craters = tuple((e.crater_radius(), e.x, e.z) for e in sim.explosions if e.bomb.exploded)
+    bombs = [(e.bomb, e.interpolated_bomb_position(alpha)) for e in sim.explosions if e.dropping]
+    shockwaves = [(e.shockwave, e.interpolated_shockwave_radius(alpha)) for e in sim.explosions if e.bomb.exploded]
+    return craters, bombs, shockwaves
+
+def draw_particles(cloud_renderer, sand_renderer, smoke_renderer=None, smoke_grid=None):
+    if smoke_renderer:
+        smoke_renderer.upload(smoke_grid)
+        smoke_renderer.draw()
+    elif cloud_renderer:
+        cloud_renderer.draw()
+    # Piasek po dymie: półprzezroczyste ziarna przed chmurą mieszają się z nią, a nie znikają pod nią.
+    sand_renderer.draw(depth_write=False)
+
+# Bez terrain_renderer (odtwarzanie nagrania) płaskie podłoże z otworami w buforze szablonu
+def draw_scene(scene_cache, bomb_mesh, craters, bombs, shockwaves, bomb_visual_scale,
+               crater_segments=32, shockwave_segments=64, terrain_renderer=None):
+    scene_cache.draw_background_sides()
+    if terrain_renderer:
+        terrain_renderer.draw()
+    elif craters:
+        scene_cache.draw_ground(crater_present=True, crater_radius=craters[0][0],
+                                crater_center_x=craters[0][1], crater_center_z=craters[0][2],
+                                extra_craters=craters[1:])
+        for crater_radius, crater_x, crater_z in craters:
+            scene_cache.draw_crater(radius=crater_radius, segments=crater_segments,
+                                    center_x=crater_x, center_z=crater_z)
+    else:
+        scene_cache.draw_ground(crater_present=False)
+    for bomb, position in bombs:
+        draw_bomb(bomb, bomb_mesh, scale=bomb_visual_scale, position=position)
+    for shockwave, radius in shockwaves:
+        draw_shockwave(shockwave, radius=radius, segments=shockwave_segments, draw_ring=scene_cache.draw_unit_circle)
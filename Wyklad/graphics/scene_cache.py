@@ -0,0 +1,46 @@
+import collections
+from OpenGL.GL import *
+from graphics.drawing import draw_crater, draw_ground, draw_background_sides, draw_unit_circle
+
+class SceneGeometryCache:
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.lists = collections.OrderedDict()
+
+    def _call(self, key, build, *args):
+        list_id = self.lists.get(key)
+        if list_id is None:
+            list_id = glGenLists(1)
+            glNewList(list_id, GL_COMPILE)
+            build(*args)
+            glEndList()
+            self.lists[key] = list_id
+            while len(self.lists) > self.max_entries:
+                _, old_id = self.lists.popitem(last=False)
+                glDeleteLists(old_id, 1)
+        else:
+            self.lists.move_to_end(key)
+        glCallList(list_id)
+
+    def draw_background_sides(self):
+        self._call(('background',), draw_background_sides)
+
+    def draw_ground(self, crater_present=False, crater_radius=0.6, crater_center_x=0.0, crater_center_z=0.0, extent=10.0, extra_craters=()):
+        if crater_present:
+            extra_craters = tuple(extra_craters)
+            key = ('ground', crater_radius, crater_center_x, crater_center_z, extent, extra_craters)
+        else:
+            key = ('ground', extent)
+        self._call(key, draw_ground, crater_present, crater_radius, crater_center_x, crater_center_z, extent, extra_craters)
+
+    def draw_crater(self, depth=0.3, radius=0.6, segments=32, center_x=0.0, center_z=0.0):
+        key = ('crater', radius, depth, segments, center_x, center_z)
+        self._call(key, draw_crater, depth, radius, segments, center_x, center_z)
+
+    def draw_unit_circle(self, segments=64):
+        self._call(('unit_circle', segments), draw_unit_circle, segments)
+
+    def delete(self):
+        for list_id in self.lists.values():
+            glDeleteLists(list_id, 1)
+        self.lists.clear()
@@ -0,0 +1,53 @@
+import numpy as np
+from config import SMOKE_RESOLUTION, SMOKE_BLUR_VOXELS, SMOKE_BOX_SNAP
+
+# Woksel trzyma liczbę cząstek (float16, układ (z, y, x)); gęstość to texels / voxel_volume
+class SmokeGrid:
+    def __init__(self, resolution=SMOKE_RESOLUTION, blur_voxels=SMOKE_BLUR_VOXELS, snap=SMOKE_BOX_SNAP):
+        self.resolution = resolution
+        self.blur_voxels = blur_voxels
+        self.snap = snap
+        self.box_min = np.zeros(3, dtype=np.float32)
+        self.box_size = np.ones(3, dtype=np.float32)
+        self.voxel_volume = 1.0 / resolution ** 3
+        self.texels = np.zeros((resolution,) * 3, dtype=np.float16)
+        self.count = 0
+
+    def splat(self, positions):
+        self.count = len(positions)
+        if self.count == 0:
+            self.texels[:] = 0
+            return self.texels
+        n = self.resolution
+        positions = np.asarray(positions, dtype=np.float32)
+        # Kolumna po kolumnie: redukcje i arytmetyka na (n, 3) wzdłuż osi 0 są kilka razy wolniejsze.
+        columns = [positions[:, axis] for axis in range(3)]
+        low = np.array([column.min() for column in columns], dtype=np.float32)
+        high = np.array([column.max() for column in columns], dtype=np.float32)
+        # Dwa przejścia rozmycia rozlewają gęstość na 2 * blur_voxels wokseli, więc tyle wynosi margines.
+        margin = (high - low) * np.float32(2 * self.blur_voxels / (n - 4 * self.blur_voxels))
+        snap = np.float32(self.snap)
+        self.box_min = np.floor((low - margin) / snap) * snap
+        self.box_size = np.maximum(np.ceil((high + margin) / snap) * snap - self.box_min, snap)
+        self.voxel_volume = float(np.prod(self.box_size.astype(np.float64))) / n ** 3
+        flat = np.zeros(len(positions), dtype=np.int32)
+        for axis, stride in ((0, 1), (1, n), (2, n * n)):
+            cell = (columns[axis] - self.box_min[axis]) * np.float32(n / self.box_size[axis])
+            np.clip(cell, 0, n - 1, out=cell)
+            flat += cell.astype(np.int32) * np.int32(stride)
+        density = np.bincount(flat, minlength=n ** 3).astype(np.float32).reshape(n, n, n)
+        for axis in range(3):
+            density = _box_blur(_box_blur(density, self.blur_voxels, axis), self.blur_voxels, axis)
+        self.texels[...] = density
+        return self.texels
+
+def _box_blur(volume, radius, axis):
+    if radius <= 0:
+        return volume
+    out = volume.copy()
+    source, target = np.moveaxis(volume, axis, 0), np.moveaxis(out, axis, 0)
+    for shift in range(1, radius + 1):
+        target[shift:] += source[:-shift]
+        target[:-shift] += source[shift:]
+    out *= np.float32(1.0 / (2 * radius + 1))
+    return out
@@ -0,0 +1,132 @@
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+from config import SMOKE_ABSORPTION
+
+SMOKE_VERTEX_SHADER = """
+#version 120
+uniform vec3 box_min;
+uniform vec3 box_size;
+varying vec3 world;
+void main() {
+    world = box_min + gl_Vertex.xyz * box_size;
+    gl_Position = gl_ModelViewProjectionMatrix * vec4(world, 1.0);
+}
+"""
+
+SMOKE_FRAGMENT_SHADER = """
+#version 120
+uniform sampler3D density;
+uniform vec3 box_min;
+uniform vec3 box_size;
+uniform vec3 camera;
+// Przekrój cząstki podzielony przez objętość woksela: tekstura trzyma liczbę cząstek w wokselu.
+uniform float absorption;
+varying vec3 world;
+void main() {
+    // Rysowane są tylne ściany prostopadłościanu: promień od kamery (albo od
+    // wejścia do pudełka, gdy kamera jest na zewnątrz) do tylnej ściany.
+    vec3 ray = world - camera;
+    float far = length(ray);
+    vec3 dir = ray / far;
+    vec3 t0 = (box_min - camera) / dir;
+    vec3 t1 = (box_min + box_size - camera) / dir;
+    vec3 t_near = min(t0, t1);
+    float near = clamp(max(max(t_near.x, t_near.y), t_near.z), 0.0, far);
+    float step = (far - near) / %(steps)d.0;
+    float transmittance = 1.0;
+    vec3 color = vec3(0.0);
+    for (int i = 0; i < %(steps)d; i++) {
+        vec3 p = camera + dir * (near + (float(i) + 0.5) * step);
+        vec3 uvw = (p - box_min) / box_size;
+        float d = texture3D(density, uvw).r;
+        float a = 1.0 - exp(-absorption * d * step);
+        // Góra chmury jaśniejsza, jak oświetlona z góry.
+        color += transmittance * a * vec3(0.4 + 0.25 * uvw.y);
+        transmittance *= 1.0 - a;
+        if (transmittance < 0.01) break;
+    }
+    if (transmittance > 0.995) discard;
+    // Głębia punktu wejścia, żeby bomby i teren przed chmurą ją zasłaniały.
+    vec4 entry = gl_ModelViewProjectionMatrix * vec4(camera + dir * near, 1.0);
+    gl_FragDepth = clamp(0.5 + 0.5 * entry.z / entry.w, 0.0, 1.0);
+    gl_FragColor = vec4(color / (1.0 - transmittance), 1.0 - transmittance);
+}
+"""
+
+# Wierzchołki sześcianu jednostkowego i ściany (po 4 wierzchołki) skierowane na zewnątrz.
+CUBE_FACES = np.array([
+    (0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0),
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1),
+    (0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0),
+    (1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1),
+    (0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1),
+    (0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0),
+], dtype=np.float32)
+
+class SmokeRenderer:
+    def __init__(self, resolution, steps=None):
+        self.resolution = resolution
+        self.steps = steps or resolution
+        self.program = shaders.compileProgram(
+            shaders.compileShader(SMOKE_VERTEX_SHADER, GL_VERTEX_SHADER),
+            shaders.compileShader(SMOKE_FRAGMENT_SHADER % {'steps': self.steps}, GL_FRAGMENT_SHADER),
+        )
+        self.locations = {name: glGetUniformLocation(self.program, name)
+                          for name in ('density', 'box_min', 'box_size', 'camera', 'absorption')}
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_3D, self.texture)
+        glTexParameteri(GL_TEXTURE_3D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_3D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        for wrap in (GL_TEXTURE_WRAP_S, GL_TEXTURE_WRAP_T, GL_TEXTURE_WRAP_R):
+            glTexParameteri(GL_TEXTURE_3D, wrap, GL_CLAMP_TO_EDGE)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage3D(GL_TEXTURE_3D, 0, GL_R16F, resolution, resolution, resolution, 0, GL_RED, GL_HALF_FLOAT, None)
+        glBindTexture(GL_TEXTURE_3D, 0)
+        self.box_min = np.zeros(3, dtype=np.float32)
+        self.box_size = np.ones(3, dtype=np.float32)
+        self.voxel_volume = 1.0
+        self.empty = True
+
+    def upload(self, grid):
+        self.empty = grid.count == 0
+        if self.empty:
+            return
+        glBindTexture(GL_TEXTURE_3D, self.texture)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        n = self.resolution
+        glTexSubImage3D(GL_TEXTURE_3D, 0, 0, 0, 0, n, n, n, GL_RED, GL_HALF_FLOAT, grid.texels)
+        glBindTexture(GL_TEXTURE_3D, 0)
+        self.box_min = grid.box_min
+        self.box_size = grid.box_size
+        self.voxel_volume = grid.voxel_volume
+
+    def draw(self, absorption=SMOKE_ABSORPTION):
+        if self.empty:
+            return
+        modelview = np.array(glGetFloatv(GL_MODELVIEW_MATRIX), dtype=np.float64).reshape(4, 4)
+        # Macierz OpenGL w pamięci jest transponowana; pozycja kamery to -R^T t.
+        camera = -modelview[:3, :3] @ modelview[3, :3]
+        glUseProgram(self.program)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_3D, self.texture)
+        glUniform1i(self.locations['density'], 0)
+        glUniform3f(self.locations['box_min'], *self.box_min)
+        glUniform3f(self.locations['box_size'], *self.box_size)
+        glUniform3f(self.locations['camera'], *camera)
+        glUniform1f(self.locations['absorption'], absorption / self.voxel_volume)
+        glEnable(GL_CULL_FACE)
+        glCullFace(GL_FRONT)
+        glDepthMask(GL_FALSE)
+        glBegin(GL_QUADS)
+        for vertex in CUBE_FACES:
+            glVertex3f(*vertex)
+        glEnd()
+        glDepthMask(GL_TRUE)
+        glDisable(GL_CULL_FACE)
+        glBindTexture(GL_TEXTURE_3D, 0)
+        glUseProgram(0)
+
+    def delete(self):
+        glDeleteTextures([self.texture])
+        glDeleteProgram(self.program)
@@ -0,0 +1,98 @@
+import numpy as np
+from OpenGL.GL import *
+from config import GROUND_LEVEL, CRATER_DEPTH
+
+GROUND_COLOR = np.array((0.94, 0.86, 0.6), dtype=np.float32)
+SCORCH_COLOR = np.array((0.12, 0.08, 0.05), dtype=np.float32)
+DEPOSIT_COLOR = np.array((0.75, 0.62, 0.4), dtype=np.float32)
+LIGHT_DIRECTION = np.array((-0.4, 1.0, -0.3), dtype=np.float32) / np.float32(np.sqrt(0.16 + 1.0 + 0.09))
+
+def grid_indices(resolution):
+    corner = np.arange(resolution * resolution, dtype=np.uint32).reshape(resolution, resolution)[:-1, :-1].ravel()
+    a, b = corner, corner + 1
+    c, d = corner + resolution, corner + resolution + 1
+    return np.column_stack((a, c, b, b, c, d)).ravel()
+
+class TerrainRenderer:
+    def __init__(self, terrain):
+        self.terrain = terrain
+        n = terrain.resolution
+        self.positions = np.empty((n, n, 3), dtype=np.float32)
+        self.positions[:, :, 0] = terrain.coords[None, :]
+        self.positions[:, :, 2] = terrain.coords[:, None]
+        self.colors = np.empty((n, n, 3), dtype=np.float32)
+        indices = grid_indices(n)
+        self.index_count = int(indices.size)
+        self.vertex_vbo, self.color_vbo, self.index_ibo = glGenBuffers(3)
+        for vbo in (self.vertex_vbo, self.color_vbo):
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, n * n * 3 * 4, None, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_ibo)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        self.uploaded_vertices = 0
+        terrain.mark_all_dirty()
+        self.update()
+
+    def update(self):
+        dirty = self.terrain.take_dirty()
+        if dirty is None:
+            return 0
+        n = self.terrain.resolution
+        # Normalne zależą od sąsiadów, więc kolor zmienia się też o jeden węzeł dalej.
+        row0, row1 = max(0, dirty[0] - 1), min(n, dirty[1] + 1)
+        col0, col1 = max(0, dirty[2] - 1), min(n, dirty[3] + 1)
+        self._rebuild(row0, row1, col0, col1)
+        if 2 * (col1 - col0) >= n:
+            col0, col1 = 0, n
+            spans = [(row0 * n, (row1 - row0) * n, slice(row0, row1))]
+        else:
+            spans = [(row * n + col0, col1 - col0, row) for row in range(row0, row1)]
+        for vbo, data in ((self.vertex_vbo, self.positions), (self.color_vbo, self.colors)):
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            for first, count, rows in spans:
+                block = np.ascontiguousarray(data[rows, col0:col1])
+                glBufferSubData(GL_ARRAY_BUFFER, first * 12, count * 12, block)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        uploaded = (row1 - row0) * (col1 - col0)
+        self.uploaded_vertices += uploaded
+        return uploaded
+
+    def _rebuild(self, row0, row1, col0, col1):
+        heights = self.terrain.heights
+        n = self.terrain.resolution
+        h = heights[row0:row1, col0:col1]
+        self.positions[row0:row1, col0:col1, 1] = GROUND_LEVEL - 0.01 + h
+        # Różnice centralne z jednym węzłem marginesu (na brzegu siatki jednostronne).
+        margin = heights[max(0, row0 - 1):min(n, row1 + 1), max(0, col0 - 1):min(n, col1 + 1)]
+        grad_z, grad_x = np.gradient(margin, self.terrain.cell)
+        inner = (slice(row0 - max(0, row0 - 1), row0 - max(0, row0 - 1) + h.shape[0]),
+                 slice(col0 - max(0, col0 - 1), col0 - max(0, col0 - 1) + h.shape[1]))
+        grad_x, grad_z = grad_x[inner], grad_z[inner]
+        # Normalna (-dh/dx, 1, -dh/dz); płaski teren ma jasność 1.
+        light = (LIGHT_DIRECTION[1] - LIGHT_DIRECTION[0] * grad_x - LIGHT_DIRECTION[2] * grad_z)
+        shade = np.clip(light / (np.sqrt(1.0 + grad_x * grad_x + grad_z * grad_z) * LIGHT_DIRECTION[1]), 0.35, 1.1)
+        scorch = np.clip(-h / CRATER_DEPTH, 0.0, 1.0)[..., None]
+        deposit = np.clip(h / 0.05, 0.0, 1.0)[..., None]
+        color = GROUND_COLOR + (DEPOSIT_COLOR - GROUND_COLOR) * deposit
+        color = color + (SCORCH_COLOR - color) * scorch
+        self.colors[row0:row1, col0:col1] = np.clip(color * shade[..., None], 0.0, 1.0)
+
+    def draw(self):
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_vbo)
+        glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, self.color_vbo)
+        glColorPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_ibo)
+        glDrawElements(GL_TRIANGLES, self.index_count, GL_UNSIGNED_INT, None)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def delete(self):
+        glDeleteBuffers(3, [self.vertex_vbo, self.color_vbo, self.index_ibo])
+        self.index_count = 0
@@ -0,0 +1,89 @@
+import argparse
+import json
+import sys
+import time
+import numpy as np
+from config import NUM_PARTICLES, NUM_SAND_PARTICLES, SETTINGS_FILE, PARTICLE_BUDGET_POLICY, UPDATE_WORKERS
+from settings_io import read_settings
+from simulation import Simulation, POLICY_RECYCLE, POLICY_THROTTLE
+from sweep import add_sweep_parser
+from recording import FrameRecorder
+
+DEFAULT_DT = 1.0 / 60.0
+
+def run_simulation(settings, frames, seed=None, dt=DEFAULT_DT,
+                   num_particles=NUM_PARTICLES, num_sand_particles=NUM_SAND_PARTICLES,
+                   barrage=0, budget_policy=PARTICLE_BUDGET_POLICY, record=None, workers=UPDATE_WORKERS):
+    sim = Simulation(settings, num_particles=num_particles, num_sand_particles=num_sand_particles,
+                     seed=seed, budget_policy=budget_policy, workers=workers)
+    if barrage:
+        sim.schedule_barrage(barrage)
+    recorder = FrameRecorder(record, {'physics_hz': 1.0 / dt}) if record else None
+    for _ in range(frames):
+        sim.step(dt)
+        if recorder:
+            recorder.record(sim)
+    if recorder:
+        recorder.close()
+    return sim
+
+def dump_state(sim, filename):
+    cloud, sand = sim.cloud, sim.sand
+    np.savez_compressed(
+        filename,
+        time=sim.time,
+        bomb=np.array([sim.bomb.x, sim.bomb.y, sim.bomb.z, sim.bomb.exploded], dtype=np.float32),
+        shockwave=np.array([sim.shockwave.radius, sim.shockwave.active], dtype=np.float32),
+        cloud_position=np.column_stack((cloud.x, cloud.y, cloud.z)),
+        cloud_velocity=np.column_stack((cloud.vx, cloud.vy, cloud.vz)),
+        cloud_life=cloud.life, cloud_phase=cloud.phase, cloud_active=cloud.active,
+        sand_position=np.column_stack((sand.x, sand.y, sand.z)),
+        sand_velocity=np.column_stack((sand.vx, sand.vy, sand.vz)),
+        sand_life=sand.life, sand_active=sand.active,
+        terrain_heights=sim.terrain.heights,
+    )
+
+def simulate_command(args):
+    settings = read_settings(args.settings)
+    start = time.perf_counter()
+    sim = run_simulation(settings, args.frames, seed=args.seed, dt=args.dt,
+                         num_particles=args.particles, num_sand_particles=args.sand_particles,
+                         barrage=args.barrage, budget_policy=args.budget_policy, record=args.record,
+                         workers=args.workers)
+    elapsed = time.perf_counter() - start
+    summary = sim.summary()
+    summary['frames'] = args.frames
+    summary['wall_time'] = elapsed
+    summary['realtime_factor'] = sim.time / elapsed if elapsed > 0 else float('inf')
+    if args.output:
+        dump_state(sim, args.output)
+    sim.close()
+    print(json.dumps(summary, indent=4))
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Symulacja wybuchu bez okna i OpenGL.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    simulate = commands.add_parser('simulate', help="Krokuje fizykę o stałe dt i wypisuje podsumowanie.")
+    simulate.add_argument('--settings', default=SETTINGS_FILE)
+    simulate.add_argument('--frames', type=int, default=600)
+    simulate.add_argument('--seed', type=int, default=None)
+    simulate.add_argument('--dt', type=float, default=DEFAULT_DT)
+    simulate.add_argument('--particles', type=int, default=NUM_PARTICLES)
+    simulate.add_argument('--sand-particles', type=int, default=NUM_SAND_PARTICLES)
+    simulate.add_argument('--barrage', type=int, default=0, help="Liczba dodatkowych bomb zrzuconych salwą.")
+    simulate.add_argument('--budget-policy', choices=(POLICY_RECYCLE, POLICY_THROTTLE), default=PARTICLE_BUDGET_POLICY)
+    simulate.add_argument('--record', default=None, help="Nagranie klatek do odtworzenia: mushroom_explosion.py --replay.")
+    simulate.add_argument('--workers', type=int, default=UPDATE_WORKERS,
+                          help="Wątki kroku cząstek (0 = wszystkie rdzenie); wynik nie zależy od tej liczby.")
+    simulate.add_argument('--output', default=None, help="Plik .npz z końcowym stanem cząstek.")
+    simulate.set_defaults(func=simulate_command)
+    add_sweep_parser(commands, SETTINGS_FILE, DEFAULT_DT)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
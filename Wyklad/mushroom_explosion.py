@@ -3,62 +3,48 @@ import pygame_gui
 from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
+import argparse
 import random
 import math
-import json
+import time
 
 from config import (
     WIDTH, HEIGHT, NUM_PARTICLES, NUM_SAND_PARTICLES, SETTINGS_FILE,
-    DEFAULT_CLOUD_SPREAD_SPEED_MIN, DEFAULT_CLOUD_SPREAD_SPEED_MAX,
-    DEFAULT_CLOUD_INITIAL_LIFT_MIN, DEFAULT_CLOUD_INITIAL_LIFT_MAX,
-    DEFAULT_CLOUD_AIR_RESISTANCE, DEFAULT_CLOUD_GRAVITY,
-    DEFAULT_PARTICLE_LIFE_MULTIPLIER,
-    DEFAULT_SAND_SPEED_MIN, DEFAULT_SAND_SPEED_MAX,
-    DEFAULT_SAND_GRAVITY_MULTIPLIER,
-    DEFAULT_SAND_LIFE_MIN, DEFAULT_SAND_LIFE_MAX
+    RENDER_FPS, PHYSICS_HZ, MAX_PHYSICS_SUBSTEPS,
+    DEFAULT_EXPLOSION_SCALE, DEFAULT_BOMB_VISUAL_SCALE, MAX_EXPLOSIONS,
+    TIMELINE_LENGTH, TIMELINE_KEYFRAME_INTERVAL, UPDATE_WORKERS, SMOKE_RESOLUTION
 )
-DEFAULT_BOMB_VISUAL_SCALE = 0.5 
+from settings_io import read_settings, write_settings, SettingsWatcher
+from physics_params import compile_params
+from simulation import Simulation
+from scheduler import FixedStepScheduler
+from graphics.drawing import load_bomb_mesh
+from graphics.scene import setup_camera, explosion_scene_objects, draw_scene, draw_particles
+from graphics.particle_renderer import ParticleRenderer
+from graphics.point_data import cloud_point_data, sand_point_data
+from graphics.scene_cache import SceneGeometryCache
+from graphics.terrain_renderer import TerrainRenderer
+from graphics.smoke_grid import SmokeGrid
+from graphics.smoke_renderer import SmokeRenderer
+from graphics.culling import FrustumCuller
+from graphics.depth_sort import DepthSorter
+from graphics.gpu_cloud import GpuCloudRenderer
+from graphics.gui_overlay import GuiOverlay, SurfaceOverlay
+from profiler import FrameProfiler
+from quality import QualityGovernor, QUALITY_LEVELS
+from recording import FrameRecorder, FrameLog, ReplayPlayer, scene_objects
+from timeline import Timeline
 
-from entities.bomb import Bomb
-from entities.particle import Particle
-from entities.sand_particle import SandParticle
-from entities.shockwave import Shockwave
-from graphics.drawing import draw_crater, draw_ground, draw_background_sides
+PROFILER_OVERLAY_HEIGHT = 200
+PROFILER_OVERLAY_INTERVAL = 10
+TIMELINE_STRIP_HEIGHT = 40
 
 global_explosion_scale = 1.0
-DEFAULT_EXPLOSION_SCALE = 1.0
-particles_activated_this_explosion = False
 current_settings = {}
 
 def load_settings():
     global current_settings
-    default_settings = {
-        'explosion_scale': DEFAULT_EXPLOSION_SCALE,
-        'cloud_spread_speed_min': DEFAULT_CLOUD_SPREAD_SPEED_MIN,
-        'cloud_spread_speed_max': DEFAULT_CLOUD_SPREAD_SPEED_MAX,
-        'cloud_initial_lift_min': DEFAULT_CLOUD_INITIAL_LIFT_MIN,
-        'cloud_initial_lift_max': DEFAULT_CLOUD_INITIAL_LIFT_MAX,
-        'cloud_air_resistance': DEFAULT_CLOUD_AIR_RESISTANCE,
-        'cloud_gravity': DEFAULT_CLOUD_GRAVITY,
-        'particle_life_multiplier': DEFAULT_PARTICLE_LIFE_MULTIPLIER,
-        'sand_speed_min': DEFAULT_SAND_SPEED_MIN,
-        'sand_speed_max': DEFAULT_SAND_SPEED_MAX,
-        'sand_gravity_multiplier': DEFAULT_SAND_GRAVITY_MULTIPLIER,
-        'sand_life_min': DEFAULT_SAND_LIFE_MIN,
-        'sand_life_max': DEFAULT_SAND_LIFE_MAX,
-        'bomb_visual_scale': DEFAULT_BOMB_VISUAL_SCALE,
-    }
-    current_settings = default_settings.copy()
-    try:
-        with open(SETTINGS_FILE, 'r') as f:
-            loaded_settings_from_file = json.load(f)
-            current_settings.update(loaded_settings_from_file)
-    except FileNotFoundError:
-        print(f"Plik {SETTINGS_FILE} nie znaleziony. Używam wartości domyślnych.")
-    except json.JSONDecodeError:
-        print(f"Błąd odczytu pliku {SETTINGS_FILE}. Używam wartości domyślnych.")
-    except Exception as e:
-        print(f"Inny błąd podczas wczytywania ustawień: {e}. Używam wartości domyślnych.")
+    current_settings = read_settings(SETTINGS_FILE)
 
 def save_settings(scale_slider=None):
     global current_settings, global_explosion_scale
@@ -67,43 +53,38 @@ def save_settings(scale_slider=None):
         global_explosion_scale = current_settings['explosion_scale']
     else:
         current_settings['explosion_scale'] = global_explosion_scale
-    try:
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(current_settings, f, indent=4)
-    except IOError:
-        print(f"Nie udało się zapisać ustawień do pliku {SETTINGS_FILE}")
+    write_settings(current_settings, SETTINGS_FILE)
 
-def reset_simulation(bomb, particles, sand_particles, shockwave, scale_slider=None, scale_label=None):
-    global global_explosion_scale, sand_shot_this_explosion, particles_activated_this_explosion, current_settings
-    bomb.reset()
+def reset_simulation(sim, scheduler, scale_slider=None, scale_label=None, gpu_cloud_renderer=None):
+    global global_explosion_scale, current_settings
     global_explosion_scale = current_settings.get('explosion_scale', DEFAULT_EXPLOSION_SCALE)
     if scale_slider is not None:
         scale_slider.set_current_value(global_explosion_scale)
     if scale_label is not None:
         scale_label.set_text(f'Skala eksplozji: {global_explosion_scale:.2f}')
-    for p in particles:
-        p.explosion_scale = global_explosion_scale
-        p.params = current_settings
-        p.reset()
-    for sp in sand_particles:
-        sp.explosion_scale = global_explosion_scale
-        sp.params = current_settings
-        sp.reset()
-    shockwave.reset()
-    sand_shot_this_explosion = False
-    particles_activated_this_explosion = False
+    sim.set_explosion_scale(global_explosion_scale)
+    sim.set_params(current_settings)
+    sim.reset()
+    scheduler.reset()
+    if gpu_cloud_renderer is not None:
+        gpu_cloud_renderer.clear()
 
-def main():
-    global global_explosion_scale, sand_shot_this_explosion, particles_activated_this_explosion, current_settings
+def main(profile=False, profile_output=None, render_fps=RENDER_FPS, physics_hz=PHYSICS_HZ, max_substeps=MAX_PHYSICS_SUBSTEPS,
+         record=None, replay=None, gpu_cloud=False, workers=UPDATE_WORKERS, smoke_resolution=None):
+    global global_explosion_scale, current_settings
+    replay_log = None
+    if replay:
+        try:
+            replay_log = FrameLog(replay)
+        except (OSError, ValueError) as e:
+            print(f"Błąd: Nie można odtworzyć nagrania {replay}: {e}")
+            return
     load_settings()
     global_explosion_scale = current_settings.get('explosion_scale', DEFAULT_EXPLOSION_SCALE)
-    sand_shot_this_explosion = False
-    particles_activated_this_explosion = False 
     pygame.init()
     pygame.display.gl_set_attribute(pygame.GL_STENCIL_SIZE, 8)
     screen = pygame.display.set_mode((WIDTH, HEIGHT), DOUBLEBUF | OPENGL)
     pygame.display.set_caption("Mushroom Cloud 3D")
-    gui_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     scene_width = int(WIDTH * 0.7)
     menu_width = WIDTH - scene_width
     menu_x_start = scene_width
@@ -111,7 +92,6 @@ def main():
     y_offset = 10
     label_height = 30
     slider_height = 30
-    button_height = 40
     spacing = 5
     scale_label = pygame_gui.elements.UILabel(
         relative_rect=pygame.Rect((menu_x_start + 10, y_offset), (menu_width - 20, label_height)),
@@ -199,16 +179,58 @@ def main():
         value_range=(0.1, 2.0), manager=manager
     )
     y_offset += slider_height + spacing * 2
+    slider_settings = {
+        cloud_spread_min_slider: 'cloud_spread_speed_min', cloud_spread_max_slider: 'cloud_spread_speed_max',
+        cloud_air_resistance_slider: 'cloud_air_resistance',
+        sand_speed_min_slider: 'sand_speed_min', sand_speed_max_slider: 'sand_speed_max',
+        sand_gravity_slider: 'sand_gravity_multiplier', bomb_scale_slider: 'bomb_visual_scale',
+    }
+
+    def refresh_labels():
+        # UILabel.set_text nie przerysowuje etykiety, której tekst się nie zmienił.
+        scale_label.set_text(f'Skala eksplozji: {global_explosion_scale:.2f}')
+        cloud_spread_label.set_text(f"Rozrzut: {current_settings['cloud_spread_speed_min']:.2f}-{current_settings['cloud_spread_speed_max']:.2f}")
+        cloud_air_resistance_label.set_text(f"Opór pow. chmury: {current_settings['cloud_air_resistance']:.4f}")
+        sand_speed_label.set_text(f"Prędkość piasku: {current_settings['sand_speed_min']:.2f}-{current_settings['sand_speed_max']:.2f}")
+        sand_gravity_label.set_text(f"Mnożnik graw. piasku: {current_settings['sand_gravity_multiplier']:.2f}")
+        bomb_scale_label.set_text(f"Skala bomby: {current_settings.get('bomb_visual_scale', DEFAULT_BOMB_VISUAL_SCALE):.2f}")
+
+    half_width = (menu_width - 20 - spacing) // 2
+    small_button_height = 30
     save_button = pygame_gui.elements.UIButton(
-        relative_rect=pygame.Rect((menu_x_start + 10, y_offset), (menu_width - 20, button_height)),
+        relative_rect=pygame.Rect((menu_x_start + 10, y_offset), (half_width, small_button_height)),
         text='Zapisz Ustawienia', manager=manager
     )
-    y_offset += button_height + spacing
     reset_button = pygame_gui.elements.UIButton(
-        relative_rect=pygame.Rect((menu_x_start + 10, y_offset), (menu_width - 20, button_height)),
+        relative_rect=pygame.Rect((menu_x_start + 10 + half_width + spacing, y_offset), (half_width, small_button_height)),
         text='Resetuj Symulację', manager=manager
     )
-    gui_texture_id = glGenTextures(1)
+    y_offset += small_button_height + spacing
+    barrage_button = pygame_gui.elements.UIButton(
+        relative_rect=pygame.Rect((menu_x_start + 10, y_offset), (half_width, small_button_height)),
+        text='Salwa Bomb', manager=manager
+    )
+    governor = QualityGovernor(1000.0 / render_fps, level=current_settings.get('quality_level'))
+    quality_button = pygame_gui.elements.UIButton(
+        relative_rect=pygame.Rect((menu_x_start + 10 + half_width + spacing, y_offset), (half_width, small_button_height)),
+        text=governor.describe(), manager=manager,
+        tool_tip_text='Kliknij, aby zablokować poziom jakości lub wrócić do trybu automatycznego.'
+    )
+    # Oś czasu w pasku pod sceną; przy nagraniu i chmurze w shaderze przewijanie nie działa.
+    timeline_enabled = not replay and not gpu_cloud
+    if timeline_enabled:
+        strip_y = HEIGHT - TIMELINE_STRIP_HEIGHT + 5
+        timeline_label = pygame_gui.elements.UILabel(
+            relative_rect=pygame.Rect((10, strip_y), (130, label_height)),
+            text='Oś czasu: 0.0 s', manager=manager
+        )
+        timeline_slider = pygame_gui.elements.UIHorizontalSlider(
+            relative_rect=pygame.Rect((150, strip_y), (scene_width - 160, slider_height)),
+            start_value=0.0, value_range=(0.0, TIMELINE_LENGTH), manager=manager
+        )
+        timeline_overlay = GuiOverlay(manager, (0, HEIGHT - TIMELINE_STRIP_HEIGHT, scene_width, TIMELINE_STRIP_HEIGHT))
+    gui_overlay = GuiOverlay(manager, (menu_x_start, 0, menu_width, HEIGHT))
+    profiler_overlay = SurfaceOverlay((0, 0, scene_width, PROFILER_OVERLAY_HEIGHT))
     glClearColor(0.0, 0.0, 0.1, 1.0)
     glEnable(GL_BLEND)
     glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
@@ -216,18 +238,57 @@ def main():
     angle_y = 0
     angle_x = 0
     camera_zoom = -6
-    particles = [Particle(initial_explosion_scale=global_explosion_scale, params=current_settings) for _ in range(NUM_PARTICLES)]
-    sand_particles = [SandParticle(initial_explosion_scale=global_explosion_scale, params=current_settings) for _ in range(NUM_SAND_PARTICLES)]
-    bomb = Bomb()
-    shockwave = Shockwave()
+    sim = Simulation(current_settings, global_explosion_scale, NUM_PARTICLES, NUM_SAND_PARTICLES, gpu_cloud=gpu_cloud,
+                     workers=workers)
+    cloud, sand = sim.cloud, sim.sand
+    scheduler = FixedStepScheduler(1.0 / physics_hz, max_substeps)
+    timeline = Timeline(sim, scheduler.step, TIMELINE_KEYFRAME_INTERVAL) if timeline_enabled else None
+    pending_seek = None
+    settings_watcher = SettingsWatcher(SETTINGS_FILE)
+    bomb_mesh = load_bomb_mesh("bomb.obj")
+    scene_cache = SceneGeometryCache(max_entries=MAX_EXPLOSIONS + 8)
+    cloud_renderer = ParticleRenderer(NUM_PARTICLES)
+    gpu_cloud_renderer = GpuCloudRenderer(NUM_PARTICLES) if gpu_cloud else None
+    sand_renderer = ParticleRenderer(NUM_SAND_PARTICLES)
+    terrain_renderer = None if replay else TerrainRenderer(sim.terrain)
+    # Chmura jako objętość tylko z cząstek liczonych na CPU (albo z nagrania).
+    smoke = smoke_resolution and not gpu_cloud
+    smoke_grid = SmokeGrid(smoke_resolution) if smoke else None
+    smoke_renderer = SmokeRenderer(smoke_resolution) if smoke else None
+    culler = FrustumCuller()
+    sand_sorter = DepthSorter(NUM_SAND_PARTICLES)
     clock = pygame.time.Clock()
+    profiler = FrameProfiler(enabled=profile or profile_output is not None)
+    show_profiler_overlay = profile
+    overlay_font = pygame.font.Font(None, 20)
+    recorder = FrameRecorder(record, {'physics_hz': physics_hz}) if record else None
+    player = ReplayPlayer(replay_log) if replay_log else None
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
+        dt = clock.tick(render_fps) / 1000.0
+        frame_start = time.perf_counter()
         time_delta = dt
+        profiler.begin_frame()
+        profiler.mark('events')
         for event in pygame.event.get():
             if event.type == QUIT:
                 running = False
+            if event.type == KEYDOWN and event.key == K_F3:
+                show_profiler_overlay = not show_profiler_overlay
+                if show_profiler_overlay and not profiler.enabled:
+                    profiler.set_enabled(True)
+            if event.type == KEYDOWN and event.key == K_F4:
+                culler.enabled = not culler.enabled
+            if player and event.type == KEYDOWN:
+                if event.key == K_SPACE: player.toggle_pause()
+                elif event.key == K_PERIOD: player.step_frames(1)
+                elif event.key == K_COMMA: player.step_frames(-1)
+                elif event.key == K_PAGEUP: player.seek(player.time + 1.0)
+                elif event.key == K_PAGEDOWN: player.seek(player.time - 1.0)
+                elif event.key == K_HOME: player.seek(0.0)
+                elif event.key == K_END: player.seek(replay_log.duration)
+                elif event.key == K_EQUALS: player.change_speed(1)
+                elif event.key == K_MINUS: player.change_speed(-1)
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 4:
                     if event.pos[0] < scene_width: camera_zoom += 0.5
@@ -235,40 +296,61 @@ def main():
                     if event.pos[0] < scene_width: camera_zoom -= 0.5
             manager.process_events(event)
             if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
-                if event.ui_element == scale_slider:
-                    global_explosion_scale = event.value
-                    current_settings['explosion_scale'] = global_explosion_scale
-                    scale_label.set_text(f'Skala eksplozji: {global_explosion_scale:.2f}')
-                    for p in particles: p.explosion_scale = global_explosion_scale
-                    for sp in sand_particles: sp.explosion_scale = global_explosion_scale
-                elif event.ui_element == cloud_spread_min_slider:
-                    current_settings['cloud_spread_speed_min'] = event.value
-                    cloud_spread_label.set_text(f"Rozrzut: {current_settings['cloud_spread_speed_min']:.2f}-{current_settings['cloud_spread_speed_max']:.2f}")
-                elif event.ui_element == cloud_spread_max_slider:
-                    current_settings['cloud_spread_speed_max'] = event.value
-                    cloud_spread_label.set_text(f"Rozrzut: {current_settings['cloud_spread_speed_min']:.2f}-{current_settings['cloud_spread_speed_max']:.2f}")
-                elif event.ui_element == cloud_air_resistance_slider:
-                    current_settings['cloud_air_resistance'] = event.value
-                    cloud_air_resistance_label.set_text(f"Opór pow. chmury: {current_settings['cloud_air_resistance']:.4f}")
-                elif event.ui_element == sand_speed_min_slider:
-                    current_settings['sand_speed_min'] = event.value
-                    sand_speed_label.set_text(f"Prędkość piasku: {current_settings['sand_speed_min']:.2f}-{current_settings['sand_speed_max']:.2f}")
-                elif event.ui_element == sand_speed_max_slider:
-                    current_settings['sand_speed_max'] = event.value
-                    sand_speed_label.set_text(f"Prędkość piasku: {current_settings['sand_speed_min']:.2f}-{current_settings['sand_speed_max']:.2f}")
-                elif event.ui_element == sand_gravity_slider:
-                    current_settings['sand_gravity_multiplier'] = event.value
-                    sand_gravity_label.set_text(f"Mnożnik graw. piasku: {current_settings['sand_gravity_multiplier']:.2f}")
-                elif event.ui_element == bomb_scale_slider:
-                    current_settings['bomb_visual_scale'] = event.value
-                    bomb_scale_label.set_text(f"Skala bomby: {current_settings['bomb_visual_scale']:.2f}")
-                for p in particles: p.params = current_settings
-                for sp in sand_particles: sp.params = current_settings
+                with profiler.stage('sliders'):
+                    if event.ui_element == scale_slider:
+                        global_explosion_scale = event.value
+                        current_settings['explosion_scale'] = global_explosion_scale
+                        sim.set_explosion_scale(global_explosion_scale)
+                    elif event.ui_element in slider_settings:
+                        current_settings[slider_settings[event.ui_element]] = event.value
+                    refresh_labels()
+                    if timeline and event.ui_element == timeline_slider:
+                        # Przy przeciąganiu skok dopiero po puszczeniu suwaka, a nie przy każdym ruchu.
+                        pending_seek = event.value
+                        timeline_label.set_text(f'Oś czasu: {event.value:.1f} s')
+                        continue
+                    if sim.set_params(current_settings) and timeline:
+                        timeline.invalidate_after(sim)
             if event.type == pygame_gui.UI_BUTTON_PRESSED:
                 if event.ui_element == reset_button:
-                    reset_simulation(bomb, particles, sand_particles, shockwave, scale_slider, scale_label)
+                    reset_simulation(sim, scheduler, scale_slider, scale_label, gpu_cloud_renderer)
+                    if timeline:
+                        timeline.close()
+                        timeline = Timeline(sim, scheduler.step, TIMELINE_KEYFRAME_INTERVAL)
+                        pending_seek = None
                 elif event.ui_element == save_button:
                     save_settings(scale_slider)
+                    settings_watcher.sync()
+                elif event.ui_element == barrage_button:
+                    sim.schedule_barrage()
+                    if timeline:
+                        timeline.invalidate_after(sim)
+                elif event.ui_element == quality_button:
+                    # Kolejno: auto -> każdy poziom od najniższego -> auto.
+                    if governor.pinned is None:
+                        governor.pin(0)
+                    elif governor.pinned < len(QUALITY_LEVELS) - 1:
+                        governor.pin(governor.pinned + 1)
+                    else:
+                        governor.pin(None)
+                    current_settings['quality_level'] = governor.pinned
+                    quality_button.set_text(governor.describe())
+        reloaded = settings_watcher.poll()
+        if reloaded is not None:
+            try:
+                params = compile_params(reloaded)
+            except (TypeError, ValueError) as e:
+                print(f"Niepoprawne wartości w {SETTINGS_FILE}: {e}")
+            else:
+                current_settings.update(reloaded)
+                global_explosion_scale = params.explosion_scale
+                scale_slider.set_current_value(global_explosion_scale)
+                for slider, key in slider_settings.items():
+                    slider.set_current_value(current_settings[key])
+                refresh_labels()
+                sim.set_explosion_scale(global_explosion_scale)
+                if sim.set_params(params) and timeline:
+                    timeline.invalidate_after(sim)
         keys = pygame.key.get_pressed()
         mouse_x, _ = pygame.mouse.get_pos()
         can_control_camera = mouse_x < scene_width and not manager.get_focus_set()
@@ -279,85 +361,150 @@ def main():
             if keys[K_DOWN]: angle_x += 1
         angle_x = max(-89.0, min(89.0, angle_x))
         camera_zoom = max(-20.0, min(-2.0, camera_zoom))
-        if not bomb.exploded:
-            sand_shot_this_explosion = False
-            particles_activated_this_explosion = False
-        bomb.update(dt)
-        if bomb.exploded:
-            if not shockwave.active:
-                shockwave.start(scale=global_explosion_scale)
-            if not particles_activated_this_explosion:
-                for p in particles:
-                    p.explosion_scale = global_explosion_scale
-                    p.params = current_settings
-                    p.activate()
-                particles_activated_this_explosion = True
-            if not sand_shot_this_explosion:
-                for sp in sand_particles:
-                    sp.explosion_scale = global_explosion_scale
-                    sp.params = current_settings
-                    sp.activate()
-                sand_shot_this_explosion = True
-            shockwave.update(dt)
-            for p in particles: p.update(dt)
-            for sp in sand_particles: sp.update(dt)
+        quality = governor.settings
+        sim.particle_fraction = quality['particle_fraction']
+        profiler.mark('physics')
+        if player:
+            player.advance(dt)
+            if profiler.frame_count % PROFILER_OVERLAY_INTERVAL == 0:
+                pygame.display.set_caption(player.describe())
+            frame = replay_log.frame(player.current_index())
+            bombs, shockwaves, craters = scene_objects(frame['explosions'])
+            bombs = [(bomb, (bomb.x, bomb.y, bomb.z)) for bomb in bombs]
+            shockwaves = [(shockwave, shockwave.radius) for shockwave in shockwaves]
         else:
-            for p in particles: p.update(dt)
-            for sp in sand_particles: sp.update(dt)
+            if pending_seek is not None and not timeline_slider.sliding_button.held:
+                timeline.seek(sim, pending_seek)
+                scheduler.reset()
+                pending_seek = None
+            if scheduler.advance(sim, dt) and recorder:
+                recorder.record(sim)
+            if timeline and sim.time <= TIMELINE_LENGTH:
+                timeline.capture(sim)
+            alpha = scheduler.alpha
+            craters, bombs, shockwaves = explosion_scene_objects(sim, alpha)
+            if gpu_cloud_renderer:
+                for launch in sim.cloud_launches:
+                    gpu_cloud_renderer.launch(launch)
+                sim.cloud_launches.clear()
+            shown_time = min(sim.time, TIMELINE_LENGTH)
+            if timeline and not timeline_slider.sliding_button.held and abs(timeline_slider.get_current_value() - shown_time) >= 0.1:
+                timeline_slider.set_current_value(shown_time)
+                timeline_label.set_text(f'Oś czasu: {shown_time:.1f} s')
+        profiler.mark('scene')
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT | GL_STENCIL_BUFFER_BIT)
         glEnable(GL_DEPTH_TEST)
-        glViewport(0, 0, scene_width, HEIGHT)
-        glMatrixMode(GL_PROJECTION); glLoadIdentity()
-        gluPerspective(45, (scene_width / float(HEIGHT)), 0.1, 50.0)
-        glMatrixMode(GL_MODELVIEW); glLoadIdentity()
-        glTranslatef(0.0, -0.6, camera_zoom)
-        glRotatef(angle_x, 1, 0, 0); glRotatef(angle_y, 0, 1, 0)
-        draw_background_sides()
-        crater_radius_val = 1.2 * global_explosion_scale
-        if bomb.exploded:
-            draw_ground(crater_present=True, crater_radius=crater_radius_val)
-            draw_crater(radius=crater_radius_val)
-        else:
-            draw_ground(crater_present=False)
-        bomb.draw(scale=current_settings.get('bomb_visual_scale', DEFAULT_BOMB_VISUAL_SCALE))
-        if bomb.exploded:
-            shockwave.draw()
-            for p in particles:
-                if p.active: p.draw()
-            for sp in sand_particles:
-                if sp.active: sp.draw()
+        setup_camera(angle_x, angle_y, camera_zoom, scene_width, HEIGHT)
+        if terrain_renderer:
+            profiler.count('teren: wierzchołki', terrain_renderer.update())
+        draw_scene(scene_cache, bomb_mesh, craters, bombs, shockwaves,
+                   current_settings.get('bomb_visual_scale', DEFAULT_BOMB_VISUAL_SCALE),
+                   quality['crater_segments'], quality['shockwave_segments'], terrain_renderer)
+        if craters:
+            stride = quality['draw_stride']
+            sand_sorter.set_camera(angle_x, angle_y, camera_zoom)
+            if player:
+                if smoke:
+                    smoke_grid.splat(frame['cloud'][0])
+                else:
+                    cloud_renderer.upload(*(a[::stride] for a in frame['cloud']))
+                replay_sand = [a[::stride] for a in frame['sand']]
+                order = sand_sorter.sort_points(replay_sand[0])
+                sand_renderer.upload(*(a[order] for a in replay_sand))
+            else:
+                culler.set_camera(angle_x, angle_y, camera_zoom, scene_width, HEIGHT)
+                if gpu_cloud_renderer:
+                    gpu_cloud_renderer.draw(sim.time - (1.0 - alpha) * scheduler.step, sim.params)
+                elif smoke:
+                    smoke_grid.splat(cloud.interpolated_positions(alpha, cloud.active_indices()))
+                else:
+                    cloud_renderer.upload(*cloud_point_data(cloud, culler.visible_indices(cloud, alpha=alpha)[::stride], alpha=alpha))
+                # Piasek zanika z wiekiem (alfa), więc jest rysowany od tyłu do przodu.
+                visible_sand = sand_sorter.sort(sand, culler.visible_indices(sand, alpha=alpha)[::stride], alpha=alpha)
+                sand_renderer.upload(*sand_point_data(sand, visible_sand, alpha=alpha))
+            draw_particles(cloud_renderer, sand_renderer, smoke_renderer, smoke_grid)
+            # Przy wyłączonym odrzucaniu (i w odtwarzaniu) licznik byłby zawsze 0, więc jest ukryty.
+            profiler.count('odrzucone', culler.culled if culler.enabled and not player else None)
+            profiler.count('sortowania pominięte', sand_sorter.skipped)
+            profiler.count('narysowane', cloud_renderer.count + sand_renderer.count)
+        profiler.mark('gui_draw')
         manager.update(time_delta)
-        gui_surface.fill((0, 0, 0, 0))
-        menu_rect_on_gui_surface = pygame.Rect(menu_x_start, 0, menu_width, HEIGHT)
-        pygame.draw.rect(gui_surface, (50, 50, 70, 255), menu_rect_on_gui_surface)
-        manager.draw_ui(gui_surface)
-        texture_surface_data = pygame.image.tobytes(gui_surface, "RGBA", flipped=True)
-        gui_width, gui_height = gui_surface.get_size()
-        glViewport(0, 0, gui_width, gui_height)
+        gui_overlay.render()
+        if timeline_enabled:
+            timeline_overlay.render()
+        if show_profiler_overlay and profiler.frame_count % PROFILER_OVERLAY_INTERVAL == 0:
+            profiler_overlay.surface.fill((0, 0, 0, 0))
+            for i, line in enumerate(profiler.overlay_lines()):
+                profiler_overlay.surface.blit(overlay_font.render(line, True, (255, 255, 0)), (10, 10 + 18 * i))
+            profiler_overlay.mark_dirty()
+        profiler.mark('gui_upload')
+        gui_overlay.upload()
+        if timeline_enabled:
+            timeline_overlay.upload()
+        if show_profiler_overlay:
+            profiler_overlay.upload()
+        glViewport(0, 0, WIDTH, HEIGHT)
         glMatrixMode(GL_PROJECTION); glPushMatrix(); glLoadIdentity()
-        gluOrtho2D(0, gui_width, gui_height, 0)
+        gluOrtho2D(0, WIDTH, HEIGHT, 0)
         glMatrixMode(GL_MODELVIEW); glPushMatrix(); glLoadIdentity()
         glDisable(GL_DEPTH_TEST)
-        glEnable(GL_TEXTURE_2D)
-        glBindTexture(GL_TEXTURE_2D, gui_texture_id)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, gui_width, gui_height, 0, GL_RGBA, GL_UNSIGNED_BYTE, texture_surface_data)
-        glColor4f(1.0, 1.0, 1.0, 1.0)
-        glBegin(GL_QUADS)
-        glTexCoord2f(0, 1); glVertex2f(0, 0)
-        glTexCoord2f(1, 1); glVertex2f(gui_width, 0)
-        glTexCoord2f(1, 0); glVertex2f(gui_width, gui_height)
-        glTexCoord2f(0, 0); glVertex2f(0, gui_height)
-        glEnd()
-        glDisable(GL_TEXTURE_2D)
+        gui_overlay.draw()
+        if timeline_enabled:
+            timeline_overlay.draw()
+        if show_profiler_overlay:
+            profiler_overlay.draw()
         glMatrixMode(GL_PROJECTION); glPopMatrix()
         glMatrixMode(GL_MODELVIEW); glPopMatrix()
+        # Czas pracy klatki bez flip: przy włączonym vsync flip czekałby na odświeżenie ekranu.
+        if governor.update((time.perf_counter() - frame_start) * 1000.0):
+            quality_button.set_text(governor.describe())
+        profiler.mark('flip')
         pygame.display.flip()
-    glDeleteTextures([gui_texture_id])
+        profiler.end_frame()
+    if profile_output:
+        profiler.export(profile_output)
+    if recorder:
+        recorder.close()
+        print(f"Zapisano {len(recorder.index)} klatek do {record} ({recorder.bytes_written / 1e6:.1f} MB)")
+    if replay_log:
+        replay_log.close()
+    gui_overlay.delete()
+    if timeline_enabled:
+        timeline_overlay.delete()
+    if timeline:
+        timeline.close()
+    scene_cache.delete()
+    if terrain_renderer:
+        terrain_renderer.delete()
+    if smoke_renderer:
+        smoke_renderer.delete()
+    profiler_overlay.delete()
+    if bomb_mesh is not None:
+        bomb_mesh.delete()
+    cloud_renderer.delete()
+    if gpu_cloud_renderer:
+        gpu_cloud_renderer.delete()
+    sand_renderer.delete()
+    sim.close()
     pygame.quit()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Symulacja wybuchu bomby grzybowej 3D.")
+    parser.add_argument('--profile', action='store_true', help="Włącz profiler klatek z nakładką (F3).")
+    parser.add_argument('--profile-output', default=None, help="Zapis śladu: .csv lub JSON (Chrome trace).")
+    parser.add_argument('--fps', type=int, default=RENDER_FPS, help="Limit klatek renderowania.")
+    parser.add_argument('--physics-hz', type=float, default=PHYSICS_HZ, help="Częstotliwość stałego kroku fizyki.")
+    parser.add_argument('--max-substeps', type=int, default=MAX_PHYSICS_SUBSTEPS, help="Maks. liczba kroków fizyki na klatkę.")
+    parser.add_argument('--record', default=None, help="Nagraj przebieg do pliku (pozycje cząstek, fale, bomby).")
+    parser.add_argument('--replay', default=None, help="Odtwórz nagranie bez liczenia fizyki.")
+    parser.add_argument('--gpu-cloud', action='store_true', help="Licz ruch chmury w shaderze zamiast na CPU (fale uderzeniowe nie pchają wtedy chmury).")
+    parser.add_argument('--workers', type=int, default=UPDATE_WORKERS, help="Wątki kroku cząstek (0 = wszystkie rdzenie).")
+    parser.add_argument('--smoke', action='store_true', help="Chmura jako objętość (siatka gęstości i marsz promienia).")
+    parser.add_argument('--smoke-resolution', type=int, default=SMOKE_RESOLUTION, help="Woksele siatki dymu na oś.")
+    args = parser.parse_args()
+    if args.record and args.gpu_cloud:
+        # Chmura z --gpu-cloud istnieje tylko w shaderze, więc nagranie miałoby sam piasek.
+        parser.error("--record nie działa z --gpu-cloud")
+    main(profile=args.profile, profile_output=args.profile_output, render_fps=args.fps,
+         physics_hz=args.physics_hz, max_substeps=args.max_substeps, record=args.record, replay=args.replay,
+         gpu_cloud=args.gpu_cloud, workers=args.workers, smoke_resolution=args.smoke_resolution if args.smoke else None)
\ No newline at end of file
@@ -0,0 +1,122 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from config import UPDATE_WORKERS, UPDATE_SHARD_SIZE, PROCESS_UPDATE_THRESHOLD
+
+BACKEND_AUTO = 'auto'
+BACKEND_THREADS = 'threads'
+BACKEND_PROCESSES = 'processes'
+
+# Sloty są zwalniane w kolejności shardów, więc wynik jest taki sam jak z jednego wątku
+class ParallelUpdater:
+    def __init__(self, workers=UPDATE_WORKERS, shard_size=UPDATE_SHARD_SIZE,
+                 process_threshold=PROCESS_UPDATE_THRESHOLD, backend=BACKEND_AUTO):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.shard_size = shard_size
+        self.process_threshold = process_threshold
+        self.backend = backend
+        self.threads = ThreadPoolExecutor(self.workers) if self.workers > 1 else None
+        self.processes = None
+        self.shared = {}
+
+    def shards(self, count):
+        n = max(self.workers, -(-count // self.shard_size))
+        bounds = np.linspace(0, count, n + 1).astype(np.int64)
+        return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    def uses_processes(self, count):
+        if self.backend == BACKEND_AUTO:
+            return count >= self.process_threshold
+        return self.backend == BACKEND_PROCESSES
+
+    def update(self, system, dt):
+        if self.workers == 1 or (system.count < 2 * self.shard_size and self.backend == BACKEND_AUTO):
+            system.update(dt)
+            return
+        if not system.active.any():
+            return
+        shards = self.shards(system.count)
+        if self.uses_processes(system.count):
+            expired = self._run_processes(system, shards, dt)
+        else:
+            futures = [self.threads.submit(system.integrate, start, stop, dt) for start, stop in shards]
+            expired = [future.result() for future in futures]
+        system.release(np.concatenate(expired))
+
+    def _run_processes(self, system, shards, dt):
+        entry = self.shared.get(id(system))
+        if entry is None:
+            entry = self.shared[id(system)] = (system, SharedParticleArrays(system))
+        spec = entry[1].spec
+        if self.processes is None:
+            self.processes = ProcessPoolExecutor(self.workers)
+        futures = [self.processes.submit(_integrate_shared, spec, system.params, system.streams, system.floor, start, stop, dt)
+                   for start, stop in shards]
+        return [future.result() for future in futures]
+
+    def close(self):
+        if self.threads:
+            self.threads.shutdown()
+            self.threads = None
+        if self.processes:
+            self.processes.shutdown()
+            self.processes = None
+        for system, shared in self.shared.values():
+            shared.release(system)
+        self.shared = {}
+
+class SharedParticleArrays:
+    def __init__(self, system):
+        arrays = [(name, value) for name, value in vars(system).items() if isinstance(value, np.ndarray)]
+        arrays.append(('pool.owner', system.pool.owner))
+        layout, offset = [], 0
+        for name, value in arrays:
+            layout.append((name, value.shape, value.dtype.str, offset))
+            offset += -(-value.nbytes // 64) * 64
+        self.memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (name, value), (_, shape, dtype, start) in zip(arrays, layout):
+            view = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf, offset=start)
+            view[...] = value
+            _set_array(system, name, view)
+        self.spec = (self.memory.name, type(system), system.count, tuple(layout))
+
+    def release(self, system):
+        for name, _, _, _ in self.spec[3]:
+            _set_array(system, name, _get_array(system, name).copy())
+        self.memory.close()
+        self.memory.unlink()
+
+def _get_array(system, name):
+    return system.pool.owner if name == 'pool.owner' else getattr(system, name)
+
+def _set_array(system, name, value):
+    if name == 'pool.owner':
+        system.pool.owner = value
+    else:
+        setattr(system, name, value)
+
+# Z puli proces roboczy potrzebuje tylko właścicieli slotów (strumienie losowe przy zmianie fazy)
+class _PoolView:
+    pass
+
+_attached = {}
+
+# W procesie roboczym
+def _integrate_shared(spec, params, streams, floor, start, stop, dt):
+    name, cls, count, layout = spec
+    entry = _attached.get(name)
+    if entry is None:
+        # Procesy robocze dzielą resource_tracker z procesem głównym, który sam zwalnia blok w close().
+        memory = shared_memory.SharedMemory(name=name)
+        system = cls.__new__(cls)
+        system.count = count
+        system.pool = _PoolView()
+        for array_name, shape, dtype, offset in layout:
+            _set_array(system, array_name, np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset))
+        entry = _attached[name] = (memory, system)
+    system = entry[1]
+    system.params = params
+    system.streams = streams
+    system.floor = floor
+    return system.integrate(start, stop, dt)
@@ -0,0 +1,53 @@
+import itertools
+from settings_io import default_settings
+
+PHYSICS_FIELDS = (
+    'explosion_scale',
+    'cloud_spread_speed_min', 'cloud_spread_speed_max',
+    'cloud_initial_lift_min', 'cloud_initial_lift_max',
+    'cloud_air_resistance', 'cloud_gravity', 'particle_life_multiplier',
+    'sand_speed_min', 'sand_speed_max', 'sand_gravity_multiplier',
+    'sand_life_min', 'sand_life_max',
+)
+
+_versions = itertools.count(1)
+
+# Niezmienny blok parametrów fizyki; każda zmiana daje nowy numer version
+class PhysicsParams:
+    __slots__ = PHYSICS_FIELDS + ('sand_gravity', 'version')
+
+    def __init__(self, settings=None):
+        values = default_settings()
+        values.update(settings or {})
+        for name in PHYSICS_FIELDS:
+            object.__setattr__(self, name, float(values[name]))
+        # Grawitacja piasku na jednostkę skali wybuchu; ziarno mnoży ją przez swoją skalę przy starcie.
+        object.__setattr__(self, 'sand_gravity', 9.8 * self.sand_gravity_multiplier)
+        object.__setattr__(self, 'version', next(_versions))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PhysicsParams jest niezmienny, zbuduj nowy blok przez compile_params()")
+
+    def __reduce__(self):
+        # Przekazanie do procesu roboczego zachowuje numer wersji.
+        return _rebuild, (self.as_dict(), self.version)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in PHYSICS_FIELDS}
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def drag_factor(self, dt):
+        # Mnożnik prędkości poziomej chmury na krok dt
+        return 1.0 - self.cloud_air_resistance * dt
+
+def _rebuild(values, version):
+    params = PhysicsParams(values)
+    object.__setattr__(params, 'version', version)
+    return params
+
+def compile_params(params):
+    if isinstance(params, PhysicsParams):
+        return params
+    return PhysicsParams(params)
@@ -0,0 +1,167 @@
+import collections
+import contextlib
+import csv
+import json
+import time
+import numpy as np
+
+FRAME_BUDGET_MS = 1000.0 / 60.0
+# Przedziały histogramu czasu klatki w ms; ostatni zbiera wszystko powyżej 50 ms
+FRAME_HISTOGRAM_BINS = np.array([0.0, 4.0, 8.0, 12.0, FRAME_BUDGET_MS, 25.0, 33.3, 50.0, np.inf])
+
+_NULL_STAGE = contextlib.nullcontext()
+
+class FrameProfiler:
+    def __init__(self, enabled=False, history=600, trace_capacity=100000):
+        self.enabled = enabled
+        self.history = history
+        self.frame_times = np.zeros(history, dtype=np.int64)
+        self.frame_count = 0
+        self.stage_times = {}
+        self.counters = {}
+        self.trace = collections.deque(maxlen=trace_capacity)
+        self._frame_start = None
+        self._frame_totals = {}
+        self._current = None
+        self._current_start = 0
+        self._current_children = 0
+        self._children = []
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self._frame_start = None
+        self._current = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self._frame_start = time.perf_counter_ns()
+        self._frame_totals = {}
+        self._current = None
+        self._current_children = 0
+
+    def mark(self, name):
+        if not self.enabled or self._frame_start is None:
+            return
+        now = time.perf_counter_ns()
+        self._close_current(now)
+        self._current = name
+        self._current_start = now
+        self._current_children = 0
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name):
+        start = time.perf_counter_ns()
+        self._children.append(0)
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            children = self._children.pop()
+            if self._children:
+                self._children[-1] += duration
+            else:
+                self._current_children += duration
+            self._record(name, start, duration, len(self._children) + 1, duration - children)
+
+    def stage(self, name):
+        if not self.enabled or self._frame_start is None:
+            return _NULL_STAGE
+        return self._timed_stage(name)
+
+    # value None ukrywa licznik
+    def count(self, name, value):
+        if not self.enabled:
+            return
+        if value is None:
+            self.counters.pop(name, None)
+        else:
+            self.counters[name] = value
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        now = time.perf_counter_ns()
+        self._close_current(now)
+        self._current = None
+        slot = self.frame_count % self.history
+        self.frame_times[slot] = now - self._frame_start
+        for name, total in self._frame_totals.items():
+            if name not in self.stage_times:
+                self.stage_times[name] = np.zeros(self.history, dtype=np.int64)
+            self.stage_times[name][slot] = total
+        for name, samples in self.stage_times.items():
+            if name not in self._frame_totals:
+                samples[slot] = 0
+        self.frame_count += 1
+        self._frame_start = None
+
+    def _close_current(self, now):
+        if self._current is not None:
+            duration = now - self._current_start
+            self._record(self._current, self._current_start, duration, 0, duration - self._current_children)
+            self._current_children = 0
+
+    def _record(self, name, start, duration, depth, own):
+        self._frame_totals[name] = self._frame_totals.get(name, 0) + own
+        self.trace.append((self.frame_count, name, start, duration, depth))
+
+    def _filled(self, samples):
+        return samples[:min(self.frame_count, self.history)]
+
+    def stats(self):
+        result = {}
+        frames = self._filled(self.frame_times)
+        if frames.size:
+            result['frame'] = self._summarize(frames)
+        for name, samples in self.stage_times.items():
+            result[name] = self._summarize(self._filled(samples))
+        return result
+
+    def _summarize(self, samples):
+        ms = samples / 1e6
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        return {'mean': float(ms.mean()), 'p50': float(p50), 'p95': float(p95), 'p99': float(p99), 'max': float(ms.max())}
+
+    def frame_histogram(self, bins=FRAME_HISTOGRAM_BINS):
+        counts, edges = np.histogram(self._filled(self.frame_times) / 1e6, bins=bins)
+        return counts, edges
+
+    def overlay_lines(self):
+        stats = self.stats()
+        if 'frame' not in stats:
+            return []
+        frame = stats['frame']
+        over_budget = int(np.count_nonzero(self._filled(self.frame_times) > FRAME_BUDGET_MS * 1e6))
+        lines = [f"klatka p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  p99 {frame['p99']:.2f} ms  (>{FRAME_BUDGET_MS:.1f} ms: {over_budget})"]
+        counts, edges = self.frame_histogram()
+        lines.append("ms " + "  ".join(f"<{hi:.0f}: {n}" if np.isfinite(hi) else f">{lo:.0f}: {n}"
+                                       for lo, hi, n in zip(edges[:-1], edges[1:], counts)))
+        for name, s in stats.items():
+            if name != 'frame':
+                lines.append(f"{name:<12s} p50 {s['p50']:6.2f}  p95 {s['p95']:6.2f}  p99 {s['p99']:6.2f} ms")
+        if self.counters:
+            lines.append("  ".join(f"{name}: {value}" for name, value in self.counters.items()))
+        return lines
+
+    def export_csv(self, filename):
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'stage', 'start_us', 'duration_us', 'depth'])
+            for frame, name, start, duration, depth in self.trace:
+                writer.writerow([frame, name, start / 1000.0, duration / 1000.0, depth])
+
+    def export_chrome_trace(self, filename):
+        events = [
+            {'name': name, 'cat': 'frame', 'ph': 'X', 'ts': start / 1000.0, 'dur': duration / 1000.0,
+             'pid': 0, 'tid': 0, 'args': {'frame': frame}}
+            for frame, name, start, duration, depth in self.trace
+        ]
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def export(self, filename):
+        if filename.endswith('.csv'):
+            self.export_csv(filename)
+        else:
+            self.export_chrome_trace(filename)
@@ -0,0 +1,64 @@
+QUALITY_LEVELS = (
+    {'name': 'niska', 'particle_fraction': 0.25, 'draw_stride': 4, 'crater_segments': 12, 'shockwave_segments': 16},
+    {'name': 'średnia', 'particle_fraction': 0.5, 'draw_stride': 2, 'crater_segments': 16, 'shockwave_segments': 24},
+    {'name': 'wysoka', 'particle_fraction': 0.75, 'draw_stride': 1, 'crater_segments': 24, 'shockwave_segments': 32},
+    {'name': 'pełna', 'particle_fraction': 1.0, 'draw_stride': 1, 'crater_segments': 32, 'shockwave_segments': 64},
+)
+
+class QualityGovernor:
+    def __init__(self, budget_ms, level=None, upper=0.95, lower=0.6,
+                 down_frames=30, up_frames=180, cooldown_frames=60, smoothing=0.1):
+        self.budget_ms = budget_ms
+        self.upper = upper
+        self.lower = lower
+        self.down_frames = down_frames
+        self.up_frames = up_frames
+        self.cooldown_frames = cooldown_frames
+        self.smoothing = smoothing
+        self.level = len(QUALITY_LEVELS) - 1
+        self.pinned = None
+        self.average_ms = 0.0
+        self._over = 0
+        self._under = 0
+        self._cooldown = 0
+        self.pin(level)
+
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+
+    # level=None oddaje sterowanie automatowi
+    def pin(self, level):
+        self.pinned = level
+        if level is not None:
+            self.level = max(0, min(len(QUALITY_LEVELS) - 1, level))
+        self._over = self._under = 0
+        self._cooldown = self.cooldown_frames
+
+    def update(self, frame_ms):
+        if self.average_ms == 0.0:
+            self.average_ms = frame_ms
+        else:
+            self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+        if self.pinned is not None:
+            return False
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return False
+        self._over = self._over + 1 if self.average_ms > self.budget_ms * self.upper else 0
+        self._under = self._under + 1 if self.average_ms < self.budget_ms * self.lower else 0
+        if self._over >= self.down_frames and self.level > 0:
+            return self._change(self.level - 1)
+        if self._under >= self.up_frames and self.level < len(QUALITY_LEVELS) - 1:
+            return self._change(self.level + 1)
+        return False
+
+    def _change(self, level):
+        self.level = level
+        self._over = self._under = 0
+        self._cooldown = self.cooldown_frames
+        return True
+
+    def describe(self):
+        mode = 'auto' if self.pinned is None else 'stała'
+        return f"Jakość: {self.settings['name']} ({mode})"
@@ -0,0 +1,201 @@
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from entities.bomb import Bomb
+from entities.shockwave import Shockwave
+from graphics.point_data import cloud_point_data, sand_point_data
+
+FILE_MAGIC = b'GRZYBLOG'
+FILE_VERSION = 1
+FRAME_MAGIC = b'FRM0'
+INDEX_MAGIC = b'IDX0'
+FRAME_HEADER = struct.Struct('<4sIdIII')
+FILE_HEADER = struct.Struct('<8sII')
+FOOTER = struct.Struct('<Q4s')
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('time', '<f8')])
+
+# Kolumny tablicy wybuchów zapisywanej w każdej klatce.
+EXPLOSION_COLUMNS = ('x', 'z', 'bomb_y', 'dropping', 'exploded', 'shockwave_radius', 'shockwave_active', 'crater_radius')
+
+PLAYBACK_SPEEDS = (0.125, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0)
+
+def _particle_blob(positions, colors, sizes):
+    return b''.join((
+        np.asarray(positions, dtype=np.float16).tobytes(),
+        np.asarray(sizes, dtype=np.float16).tobytes(),
+        np.clip(np.asarray(colors) * 255.0 + 0.5, 0, 255).astype(np.uint8).tobytes(),
+    ))
+
+# Każdy blok ma własny nagłówek, więc plik bez indeksu da się odczytać po kolei
+class FrameRecorder:
+    def __init__(self, filename, metadata=None):
+        self.filename = filename
+        self.file = open(filename, 'wb')
+        header = json.dumps(metadata or {}).encode('utf-8')
+        self.file.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, len(header)))
+        self.file.write(header)
+        self.index = []
+        self.bytes_written = self.file.tell()
+
+    def record(self, sim, cloud_idx=None, sand_idx=None):
+        # Usunięte wybuchy zostawiają tylko krater: wiersz wybuchu bez bomby i z wygasłą falą.
+        explosions = np.array([
+            (e.x, e.z, e.bomb.y, e.dropping, e.bomb.exploded, e.shockwave.radius, e.shockwave.active, e.crater_radius())
+            for e in sim.explosions
+        ] + [(x, z, 0.0, 0.0, 1.0, 0.0, 0.0, radius) for x, z, radius in sim.retired_craters],
+            dtype=np.float32).reshape(-1, len(EXPLOSION_COLUMNS))
+        cloud = cloud_point_data(sim.cloud, cloud_idx)
+        sand = sand_point_data(sim.sand, sand_idx)
+        offset = self.file.tell()
+        self.file.write(FRAME_HEADER.pack(FRAME_MAGIC, len(self.index), sim.time,
+                                          len(explosions), len(cloud[2]), len(sand[2])))
+        self.file.write(explosions.tobytes())
+        self.file.write(_particle_blob(*cloud))
+        self.file.write(_particle_blob(*sand))
+        self.index.append((offset, sim.time))
+        self.bytes_written = self.file.tell()
+
+    def close(self):
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        self.file.write(np.array(self.index, dtype=INDEX_DTYPE).tobytes())
+        self.file.write(FOOTER.pack(index_offset, INDEX_MAGIC))
+        self.file.close()
+
+class FrameLog:
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        self.buffer = None
+        try:
+            self._open(filename)
+        except ValueError:
+            if self.buffer is not None:
+                self.buffer.close()
+            self.file.close()
+            raise
+
+    def _open(self, filename):
+        if os.fstat(self.file.fileno()).st_size < FILE_HEADER.size:
+            raise ValueError(f"{filename} nie jest nagraniem symulacji (plik jest pusty lub ucięty).")
+        self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_size = FILE_HEADER.unpack_from(self.buffer, 0)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError(f"{filename} nie jest nagraniem symulacji (wersja {FILE_VERSION}).")
+        self.metadata = json.loads(self.buffer[FILE_HEADER.size:FILE_HEADER.size + header_size])
+        self.data_start = FILE_HEADER.size + header_size
+        self.index = self._read_index()
+        if len(self.index) == 0:
+            self.index = None
+            raise ValueError(f"{filename} nie zawiera żadnej klatki.")
+        self.times = self.index['time']
+
+    def _read_index(self):
+        if len(self.buffer) >= self.data_start + FOOTER.size:
+            index_offset, magic = FOOTER.unpack_from(self.buffer, len(self.buffer) - FOOTER.size)
+            if magic == INDEX_MAGIC:
+                count = (len(self.buffer) - FOOTER.size - index_offset) // INDEX_DTYPE.itemsize
+                return np.frombuffer(self.buffer, dtype=INDEX_DTYPE, count=count, offset=index_offset)
+        return self._scan_index()
+
+    def _scan_index(self):
+        entries = []
+        offset = self.data_start
+        while offset + FRAME_HEADER.size <= len(self.buffer):
+            magic, _, time, n_explosions, n_cloud, n_sand = FRAME_HEADER.unpack_from(self.buffer, offset)
+            end = offset + FRAME_HEADER.size + 4 * n_explosions * len(EXPLOSION_COLUMNS) + 12 * (n_cloud + n_sand)
+            if magic != FRAME_MAGIC or end > len(self.buffer):
+                break
+            entries.append((offset, time))
+            offset = end
+        return np.array(entries, dtype=INDEX_DTYPE)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def duration(self):
+        return float(self.times[-1]) if len(self) else 0.0
+
+    def frame_at(self, time):
+        return max(0, min(len(self) - 1, int(np.searchsorted(self.times, time, side='right')) - 1))
+
+    def _particles(self, offset, n):
+        positions = np.frombuffer(self.buffer, dtype=np.float16, count=3 * n, offset=offset).reshape(n, 3)
+        offset += 6 * n
+        sizes = np.frombuffer(self.buffer, dtype=np.float16, count=n, offset=offset)
+        offset += 2 * n
+        colors = np.frombuffer(self.buffer, dtype=np.uint8, count=4 * n, offset=offset).reshape(n, 4)
+        return (positions, colors.astype(np.float32) / 255.0, sizes), offset + 4 * n
+
+    def frame(self, i):
+        offset = int(self.index['offset'][i])
+        _, _, time, n_explosions, n_cloud, n_sand = FRAME_HEADER.unpack_from(self.buffer, offset)
+        offset += FRAME_HEADER.size
+        explosions = np.frombuffer(self.buffer, dtype=np.float32, count=n_explosions * len(EXPLOSION_COLUMNS),
+                                   offset=offset).reshape(n_explosions, len(EXPLOSION_COLUMNS))
+        offset += explosions.nbytes
+        cloud, offset = self._particles(offset, n_cloud)
+        sand, offset = self._particles(offset, n_sand)
+        return {'time': time, 'explosions': explosions, 'cloud': cloud, 'sand': sand}
+
+    def close(self):
+        self.index = self.times = None
+        try:
+            self.buffer.close()
+        except BufferError:
+            pass  # Zwrócone klatki wciąż wskazują na bufor; mmap zwolni się razem z nimi.
+        self.file.close()
+
+def scene_objects(explosions):
+    bombs, shockwaves, craters = [], [], []
+    for x, z, bomb_y, dropping, exploded, radius, active, crater_radius in explosions.tolist():
+        if exploded:
+            craters.append((crater_radius, x, z))
+            shockwave = Shockwave(x, z)
+            shockwave.radius = radius
+            shockwave.active = bool(active)
+            shockwaves.append(shockwave)
+        elif dropping:
+            bomb = Bomb(x, z)
+            bomb.y = bomb_y
+            bombs.append(bomb)
+    return bombs, shockwaves, craters
+
+class ReplayPlayer:
+    def __init__(self, log):
+        self.log = log
+        self.time = float(log.times[0]) if len(log) else 0.0
+        self.speed_index = PLAYBACK_SPEEDS.index(1.0)
+        self.paused = False
+
+    @property
+    def speed(self):
+        return PLAYBACK_SPEEDS[self.speed_index]
+
+    def change_speed(self, step):
+        self.speed_index = max(0, min(len(PLAYBACK_SPEEDS) - 1, self.speed_index + step))
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def seek(self, time):
+        if len(self.log):
+            self.time = min(max(time, float(self.log.times[0])), self.log.duration)
+
+    def step_frames(self, n):
+        i = max(0, min(len(self.log) - 1, self.current_index() + n))
+        self.time = float(self.log.times[i])
+
+    def advance(self, dt):
+        if not self.paused:
+            self.seek(self.time + dt * self.speed)
+
+    def current_index(self):
+        return self.log.frame_at(self.time)
+
+    def describe(self):
+        state = 'pauza' if self.paused else f'x{self.speed:g}'
+        return f"Odtwarzanie {self.time:6.2f} / {self.log.duration:.2f} s  klatka {self.current_index() + 1}/{len(self.log)}  {state}"
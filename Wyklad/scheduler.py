@@ -0,0 +1,31 @@
+from config import PHYSICS_HZ, MAX_PHYSICS_SUBSTEPS
+
+class FixedStepScheduler:
+    def __init__(self, step=1.0 / PHYSICS_HZ, max_substeps=MAX_PHYSICS_SUBSTEPS):
+        self.step = step
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.dropped_time = 0.0
+
+    def set_rate(self, hz):
+        self.step = 1.0 / hz
+        self.accumulator = min(self.accumulator, self.step)
+
+    def advance(self, sim, frame_dt):
+        self.accumulator += frame_dt
+        substeps = 0
+        while self.accumulator >= self.step and substeps < self.max_substeps:
+            sim.step(self.step)
+            self.accumulator -= self.step
+            substeps += 1
+        if self.accumulator >= self.step:
+            # Po przekroczeniu limitu podkroków zaległy czas jest odrzucany, zamiast narastać.
+            self.dropped_time += self.accumulator - self.step
+            self.accumulator = self.step
+        self.alpha = self.accumulator / self.step
+        return substeps
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 1.0
@@ -0,0 +1,89 @@
+import json
+import os
+import time
+from config import (
+    SETTINGS_FILE, DEFAULT_EXPLOSION_SCALE, DEFAULT_BOMB_VISUAL_SCALE,
+    DEFAULT_CLOUD_SPREAD_SPEED_MIN, DEFAULT_CLOUD_SPREAD_SPEED_MAX,
+    DEFAULT_CLOUD_INITIAL_LIFT_MIN, DEFAULT_CLOUD_INITIAL_LIFT_MAX,
+    DEFAULT_CLOUD_AIR_RESISTANCE, DEFAULT_CLOUD_GRAVITY,
+    DEFAULT_PARTICLE_LIFE_MULTIPLIER,
+    DEFAULT_SAND_SPEED_MIN, DEFAULT_SAND_SPEED_MAX,
+    DEFAULT_SAND_GRAVITY_MULTIPLIER,
+    DEFAULT_SAND_LIFE_MIN, DEFAULT_SAND_LIFE_MAX
+)
+
+def default_settings():
+    return {
+        'explosion_scale': DEFAULT_EXPLOSION_SCALE,
+        'cloud_spread_speed_min': DEFAULT_CLOUD_SPREAD_SPEED_MIN,
+        'cloud_spread_speed_max': DEFAULT_CLOUD_SPREAD_SPEED_MAX,
+        'cloud_initial_lift_min': DEFAULT_CLOUD_INITIAL_LIFT_MIN,
+        'cloud_initial_lift_max': DEFAULT_CLOUD_INITIAL_LIFT_MAX,
+        'cloud_air_resistance': DEFAULT_CLOUD_AIR_RESISTANCE,
+        'cloud_gravity': DEFAULT_CLOUD_GRAVITY,
+        'particle_life_multiplier': DEFAULT_PARTICLE_LIFE_MULTIPLIER,
+        'sand_speed_min': DEFAULT_SAND_SPEED_MIN,
+        'sand_speed_max': DEFAULT_SAND_SPEED_MAX,
+        'sand_gravity_multiplier': DEFAULT_SAND_GRAVITY_MULTIPLIER,
+        'sand_life_min': DEFAULT_SAND_LIFE_MIN,
+        'sand_life_max': DEFAULT_SAND_LIFE_MAX,
+        'bomb_visual_scale': DEFAULT_BOMB_VISUAL_SCALE,
+    }
+
+# Jak read_settings, ale zgłasza błędy odczytu
+def load_settings_file(filename=SETTINGS_FILE):
+    settings = default_settings()
+    with open(filename, 'r') as f:
+        settings.update(json.load(f))
+    return settings
+
+def read_settings(filename=SETTINGS_FILE):
+    settings = default_settings()
+    try:
+        settings = load_settings_file(filename)
+    except FileNotFoundError:
+        print(f"Plik {filename} nie znaleziony. Używam wartości domyślnych.")
+    except json.JSONDecodeError:
+        print(f"Błąd odczytu pliku {filename}. Używam wartości domyślnych.")
+    except Exception as e:
+        print(f"Inny błąd podczas wczytywania ustawień: {e}. Używam wartości domyślnych.")
+    return settings
+
+def write_settings(settings, filename=SETTINGS_FILE):
+    try:
+        with open(filename, 'w') as f:
+            json.dump(settings, f, indent=4)
+    except IOError:
+        print(f"Nie udało się zapisać ustawień do pliku {filename}")
+
+class SettingsWatcher:
+    def __init__(self, filename=SETTINGS_FILE, interval=1.0):
+        self.filename = filename
+        self.interval = interval
+        self.next_check = time.monotonic() + interval
+        self.stamp = self._stamp()
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def sync(self):
+        self.stamp = self._stamp()
+
+    def poll(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now < self.next_check:
+            return None
+        self.next_check = now + self.interval
+        stamp = self._stamp()
+        if stamp is None or stamp == self.stamp:
+            return None
+        self.stamp = stamp
+        try:
+            return load_settings_file(self.filename)
+        except (OSError, ValueError) as e:
+            print(f"Pominięto zmieniony plik {self.filename}: {e}")
+            return None
@@ -0,0 +1,282 @@
+import copy
+import numpy as np
+from config import (
+    NUM_PARTICLES, NUM_SAND_PARTICLES, GROUND_LEVEL,
+    PARTICLE_BUDGET_POLICY, BARRAGE_SIZE, MAX_EXPLOSIONS, UPDATE_WORKERS, SAND_GRAIN_VOLUME,
+    TERRAIN_MIN_HEIGHT
+)
+from entities.explosion import Explosion
+from entities.cloud_system import CloudParticleSystem, PHASE_CLOUD
+from entities.sand_system import SandParticleSystem
+from entities.cloud_trajectory import launch_parameters
+from entities.random_streams import RandomStreams
+from entities.terrain import Terrain
+from entities.shockwave_impulse import ShockwaveImpulse
+from physics_params import compile_params
+from parallel_update import ParallelUpdater
+
+POLICY_RECYCLE = 'recycle'
+POLICY_THROTTLE = 'throttle'
+
+class Simulation:
+    def __init__(self, params, explosion_scale=None, num_particles=NUM_PARTICLES,
+                 num_sand_particles=NUM_SAND_PARTICLES, seed=None, budget_policy=PARTICLE_BUDGET_POLICY,
+                 gpu_cloud=False, workers=UPDATE_WORKERS):
+        params = self.params = compile_params(params)
+        if explosion_scale is None:
+            explosion_scale = params.explosion_scale
+        self.explosion_scale = explosion_scale
+        self.budget_policy = budget_policy
+        self.particle_fraction = 1.0
+        # Z gpu_cloud chmura nie jest krokowana na CPU: przy wybuchu powstają tylko parametry
+        # startowe (cloud_launches), które renderer wysyła do shadera.
+        self.gpu_cloud = gpu_cloud
+        self.cloud_launches = []
+        cloud_seed, sand_seed, barrage_seed = np.random.SeedSequence(seed).spawn(3)
+        # Cząstki losują z bezstanowych strumieni Philox, więc ich liczby nie zależą od kolejności aktualizacji.
+        self.cloud = CloudParticleSystem(num_particles, explosion_scale, params, RandomStreams(cloud_seed))
+        self.sand = SandParticleSystem(num_sand_particles, explosion_scale, params, RandomStreams(sand_seed))
+        self.barrage_rng = np.random.default_rng(barrage_seed)
+        self.terrain = Terrain()
+        # Lądowanie na terenie sprawdza _settle_sand; system usuwa tylko ziarna poniżej dna skały.
+        self.sand.floor = GROUND_LEVEL + TERRAIN_MIN_HEIGHT - 0.1
+        self.impulse = ShockwaveImpulse()
+        self.updater = ParallelUpdater(workers)
+        self.next_explosion_id = 0
+        self.explosions = []
+        self.retired_craters = []
+        self.primary = self.add_explosion(0.0, 0.0, explosion_scale)
+        self.time = 0.0
+
+    @property
+    def bomb(self):
+        return self.primary.bomb
+
+    @property
+    def shockwave(self):
+        return self.primary.shockwave
+
+    def add_explosion(self, x=0.0, z=0.0, scale=None, delay=0.0, cloud_budget=None, sand_budget=None):
+        if scale is None:
+            scale = self.explosion_scale
+        explosion = Explosion(self.next_explosion_id, x, z, scale, delay, cloud_budget, sand_budget)
+        self.next_explosion_id += 1
+        self.explosions.append(explosion)
+        return explosion
+
+    def schedule_barrage(self, count=BARRAGE_SIZE, area_radius=4.0, scale_range=(0.3, 1.2), interval=0.3):
+        count = min(count, MAX_EXPLOSIONS - len(self.explosions))
+        if count <= 0:
+            return []
+        rng = self.barrage_rng
+        angles = rng.uniform(0, 2 * np.pi, count)
+        radii = area_radius * np.sqrt(rng.uniform(0, 1, count))
+        scales = rng.uniform(scale_range[0], scale_range[1], count)
+        delays = interval * np.arange(count) + rng.uniform(0, interval, count)
+        cloud_budget = max(1, 2 * self.cloud.count // count)
+        sand_budget = max(1, 2 * self.sand.count // count)
+        return [
+            self.add_explosion(float(radii[i] * np.cos(angles[i])), float(radii[i] * np.sin(angles[i])),
+                               float(scales[i]), float(delays[i]), cloud_budget, sand_budget)
+            for i in range(count)
+        ]
+
+    # Zwraca False, gdy wartości fizyki się nie zmieniły
+    def set_params(self, params):
+        params = compile_params(params)
+        if params is not self.params and params.as_dict() == self.params.as_dict():
+            return False
+        self.params = params
+        self.cloud.params = params
+        self.sand.params = params
+        return True
+
+    def set_explosion_scale(self, scale):
+        self.explosion_scale = scale
+        self.primary.scale = scale
+        self.cloud.set_explosion_scale(scale, owner=self.primary.id)
+        self.sand.set_explosion_scale(scale, owner=self.primary.id)
+
+    def reset(self):
+        self.explosions = [self.primary]
+        self.retired_craters = []
+        self.primary.scale = self.explosion_scale
+        self.primary.reset()
+        self.cloud.explosion_scale = self.explosion_scale
+        self.cloud.reset()
+        self.sand.explosion_scale = self.explosion_scale
+        self.sand.reset()
+        self.terrain.reset()
+        self.cloud_launches = []
+        self.time = 0.0
+        self.save_previous()
+
+    def save_previous(self):
+        self.cloud.save_previous()
+        self.sand.save_previous()
+        for explosion in self.explosions:
+            explosion.save_previous()
+
+    def step(self, dt):
+        self.save_previous()
+        self.time += dt
+        for explosion in self.explosions:
+            if not explosion.dropping:
+                explosion.delay -= dt
+                continue
+            explosion.bomb.update(dt)
+            if not explosion.bomb.exploded:
+                continue
+            if not explosion.detonated:
+                # Fala startuje raz, przy detonacji; po wygaśnięciu już nie wraca.
+                explosion.shockwave.start(scale=explosion.scale)
+                self._detonate(explosion)
+            explosion.shockwave.update(dt)
+        if not self.gpu_cloud:
+            self.updater.update(self.cloud, dt)
+        self.updater.update(self.sand, dt)
+        self._settle_sand()
+        self._push_particles()
+        self._retire_explosions()
+
+    # primary zostaje dla GUI
+    def _retire_explosions(self):
+        done = [e for e in self.explosions if e is not self.primary and e.detonated and not e.shockwave.active]
+        if not done:
+            return
+        # Jedno np.bincount po właścicielach obu pul zamiast szukania slotów każdego wybuchu osobno.
+        owners = np.concatenate((self.cloud.pool.owner, self.sand.pool.owner))
+        leased = np.bincount(owners[owners >= 0], minlength=max(e.id for e in done) + 1)
+        retired = {e.id for e in done if leased[e.id] == 0}
+        if not retired:
+            return
+        self.retired_craters.extend((e.x, e.z, e.crater_radius()) for e in self.explosions if e.id in retired)
+        self.explosions = [e for e in self.explosions if e.id not in retired]
+
+    def shockwave_rings(self):
+        rings = [
+            (e.x, e.z, e.previous_shockwave_radius if e.previous_shockwave_radius <= e.shockwave.radius else 0.0,
+             e.shockwave.radius, e.shockwave.max_radius(), e.shockwave.scale)
+            for e in self.explosions if e.shockwave.active
+        ]
+        return np.array(rings, dtype=np.float64).reshape(-1, 6)
+
+    def _push_particles(self):
+        rings = self.shockwave_rings()
+        if not len(rings):
+            return
+        if not self.gpu_cloud:
+            self.impulse.apply(self.cloud, rings)
+        self.impulse.apply(self.sand, rings)
+
+    def _settle_sand(self):
+        sand = self.sand
+        idx = sand.active_indices()
+        if idx.size == 0:
+            return
+        x, z = sand.x[idx], sand.z[idx]
+        landed = (sand.vy[idx] < 0) & (sand.y[idx] <= GROUND_LEVEL + self.terrain.height_at(x, z))
+        if not landed.any():
+            return
+        idx = idx[landed]
+        self.terrain.deposit(x[landed], z[landed], SAND_GRAIN_VOLUME * sand.scale[idx] ** 2)
+        sand.release(idx)
+
+    def _detonate(self, explosion):
+        explosion.detonated = True
+        self.terrain.carve_crater(explosion.x, explosion.z, explosion.crater_radius(), explosion.crater_depth())
+        if self.gpu_cloud:
+            wanted = self._budget(self.cloud, explosion.cloud_budget)
+            self.cloud_launches.append(launch_parameters(self.cloud.streams, wanted, (explosion.x, explosion.z),
+                                                         explosion.scale, self.time, self.params, explosion.id))
+        else:
+            self._lease(self.cloud, explosion, explosion.cloud_budget)
+        self._lease(self.sand, explosion, explosion.sand_budget)
+
+    def _budget(self, system, budget):
+        wanted = system.count if budget is None else min(budget, system.count)
+        return max(1, int(wanted * self.particle_fraction))
+
+    def _lease(self, system, explosion, budget):
+        wanted = self._budget(system, budget)
+        missing = wanted - system.pool.free_count
+        if missing > 0 and self.budget_policy == POLICY_RECYCLE:
+            system.reclaim(missing, keep_owner=explosion.id)
+        return system.spawn(wanted, (explosion.x, explosion.z), explosion.scale, explosion.id)
+
+    def close(self):
+        self.updater.close()
+
+    def snapshot(self):
+        return {
+            'time': self.time,
+            'params': self.params,
+            'explosion_scale': self.explosion_scale,
+            'explosions': copy.deepcopy(self.explosions),
+            'retired_craters': list(self.retired_craters),
+            'next_explosion_id': self.next_explosion_id,
+            'cloud': _snapshot_system(self.cloud),
+            'sand': _snapshot_system(self.sand),
+            'terrain': self.terrain.heights.copy(),
+            'barrage_rng': self.barrage_rng.bit_generator.state,
+            'cloud_launches': [launch.copy() for launch in self.cloud_launches],
+        }
+
+    def restore(self, snapshot):
+        self.time = snapshot['time']
+        self.set_params(snapshot['params'])
+        self.explosion_scale = snapshot['explosion_scale']
+        self.explosions = copy.deepcopy(snapshot['explosions'])
+        self.primary = self.explosions[0]
+        self.retired_craters = list(snapshot['retired_craters'])
+        self.next_explosion_id = snapshot['next_explosion_id']
+        _restore_system(self.cloud, snapshot['cloud'])
+        _restore_system(self.sand, snapshot['sand'])
+        np.copyto(self.terrain.heights, snapshot['terrain'])
+        self.terrain.mark_all_dirty()
+        self.barrage_rng.bit_generator.state = snapshot['barrage_rng']
+        self.cloud_launches = [launch.copy() for launch in snapshot['cloud_launches']]
+        self.save_previous()
+
+    def summary(self):
+        cloud_active = self.cloud.active.view(bool)
+        cap = cloud_active & (self.cloud.phase == PHASE_CLOUD)
+        sand_active = self.sand.active.view(bool)
+        cap_radius = np.hypot(self.cloud.x[cap], self.cloud.z[cap])
+        sand_radius = np.hypot(self.sand.x[sand_active], self.sand.z[sand_active])
+        return {
+            'time': self.time,
+            'explosion_scale': self.explosion_scale,
+            'explosions': len(self.explosions),
+            'bomb_exploded': self.bomb.exploded,
+            'bomb_y': self.bomb.y,
+            'shockwave_active': self.shockwave.active,
+            'shockwave_radius': self.shockwave.radius,
+            'cloud_active': int(cloud_active.sum()),
+            'cloud_max_height': float(self.cloud.y[cloud_active].max()) if cloud_active.any() else 0.0,
+            'cloud_cap_radius': float(cap_radius.max()) if cap_radius.size else 0.0,
+            'sand_active': int(sand_active.sum()),
+            'sand_footprint_radius': float(sand_radius.max()) if sand_radius.size else 0.0,
+            'terrain_min_height': float(self.terrain.heights.min()),
+            'terrain_max_height': float(self.terrain.heights.max()),
+        }
+
+def _snapshot_system(system):
+    # prev_* nie są zapisywane: po restore() save_previous() ustawia je na bieżące pozycje.
+    arrays = {name: value.copy() for name, value in vars(system).items()
+              if isinstance(value, np.ndarray) and not name.startswith('prev_')}
+    pool = {name: value.copy() for name, value in vars(system.pool).items() if isinstance(value, np.ndarray)}
+    return {
+        'arrays': arrays, 'pool': pool, 'free_count': system.pool.free_count,
+        'explosion_scale': system.explosion_scale, 'streams': system.streams,
+    }
+
+def _restore_system(system, snapshot):
+    for name, value in snapshot['arrays'].items():
+        np.copyto(getattr(system, name), value)
+    for name, value in snapshot['pool'].items():
+        np.copyto(getattr(system.pool, name), value)
+    system.pool.free_count = snapshot['free_count']
+    system.explosion_scale = snapshot['explosion_scale']
+    # Strumienie są bezstanowe; przenoszony jest tylko klucz, gdy migawka trafia do innej symulacji.
+    system.streams = snapshot['streams']
@@ -0,0 +1,199 @@
+import csv
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from entities.cloud_system import PHASE_CLOUD
+from settings_io import read_settings, default_settings
+from simulation import Simulation
+
+SWEEP_PARTICLES = 4000
+SWEEP_SAND_PARTICLES = 2000
+SWEEP_FRAMES = 900
+SWEEP_SAMPLE_EVERY = 5
+CHECKPOINT_EVERY = 50
+
+METRIC_COLUMNS = (
+    'detonation_time', 'peak_cloud_height', 'peak_cap_radius', 'peak_sand_footprint',
+    'cloud_lifetime', 'sand_lifetime', 'sim_time', 'wall_time',
+)
+
+# 'nazwa=min:max[:kroki]' albo 'nazwa=a,b,c'
+def parse_parameter(text):
+    name, _, spec = text.partition('=')
+    if name not in default_settings():
+        raise ValueError(f"Nieznany parametr: {name}")
+    if ':' in spec:
+        parts = spec.split(':')
+        low, high = float(parts[0]), float(parts[1])
+        steps = int(parts[2]) if len(parts) > 2 else None
+        return name, (low, high, steps)
+    return name, [float(v) for v in spec.split(',')]
+
+def grid_configurations(parameters, default_steps=5):
+    names = list(parameters)
+    axes = []
+    for name in names:
+        spec = parameters[name]
+        if isinstance(spec, tuple):
+            low, high, steps = spec
+            axes.append(np.linspace(low, high, steps or default_steps).tolist())
+        else:
+            axes.append(spec)
+    return [dict(zip(names, values)) for values in itertools.product(*axes)]
+
+def random_configurations(parameters, samples, seed=None):
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, spec in parameters.items():
+        if isinstance(spec, tuple):
+            columns[name] = rng.uniform(spec[0], spec[1], samples)
+        else:
+            columns[name] = rng.choice(spec, samples)
+    return [{name: float(columns[name][i]) for name in parameters} for i in range(samples)]
+
+def measure_run(sim, frames, dt, sample_every=SWEEP_SAMPLE_EVERY):
+    metrics = dict.fromkeys(METRIC_COLUMNS, 0.0)
+    metrics['detonation_time'] = float('nan')
+    cloud, sand = sim.cloud, sim.sand
+    for frame in range(1, frames + 1):
+        sim.step(dt)
+        detonated = sim.bomb.exploded
+        if detonated and np.isnan(metrics['detonation_time']):
+            metrics['detonation_time'] = sim.time
+        if not detonated or (frame % sample_every and frame != frames):
+            continue
+        cloud_active = cloud.active.view(bool)
+        sand_active = sand.active.view(bool)
+        if cloud_active.any():
+            metrics['peak_cloud_height'] = max(metrics['peak_cloud_height'], float(cloud.y[cloud_active].max()))
+            cap = cloud_active & (cloud.phase == PHASE_CLOUD)
+            if cap.any():
+                radius = float(np.sqrt((cloud.x[cap] ** 2 + cloud.z[cap] ** 2).max()))
+                metrics['peak_cap_radius'] = max(metrics['peak_cap_radius'], radius)
+            metrics['cloud_lifetime'] = sim.time - metrics['detonation_time']
+        if sand_active.any():
+            radius = float(np.sqrt((sand.x[sand_active] ** 2 + sand.z[sand_active] ** 2).max()))
+            metrics['peak_sand_footprint'] = max(metrics['peak_sand_footprint'], radius)
+            metrics['sand_lifetime'] = sim.time - metrics['detonation_time']
+        if not cloud_active.any() and not sand_active.any():
+            break
+    metrics['sim_time'] = sim.time
+    return metrics
+
+def run_configuration(task):
+    config_id, overrides, base_settings, frames, dt, seed, num_particles, num_sand_particles = task
+    settings = dict(base_settings)
+    settings.update(overrides)
+    start = time.perf_counter()
+    sim = Simulation(settings, num_particles=num_particles, num_sand_particles=num_sand_particles,
+                     seed=[seed, config_id])
+    metrics = measure_run(sim, frames, dt)
+    metrics['wall_time'] = time.perf_counter() - start
+    row = {'config_id': config_id}
+    row.update(overrides)
+    row.update(metrics)
+    return row
+
+def completed_ids(filename):
+    if not os.path.exists(filename):
+        return set()
+    with open(filename, newline='') as f:
+        # Wiersz urwany przez przerwanie procesu nie ma ostatniej kolumny i zostanie policzony ponownie.
+        return {int(row['config_id']) for row in csv.DictReader(f) if row.get(METRIC_COLUMNS[-1])}
+
+def _ends_with_newline(filename):
+    with open(filename, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+def check_spec(filename, spec):
+    spec_file = filename + '.spec.json'
+    if os.path.exists(spec_file):
+        with open(spec_file) as f:
+            if json.load(f) != spec:
+                return False
+    else:
+        with open(spec_file, 'w') as f:
+            json.dump(spec, f, indent=4)
+    return True
+
+def run_sweep(configurations, output, base_settings, frames=SWEEP_FRAMES, dt=1.0 / 60.0, seed=0,
+              num_particles=SWEEP_PARTICLES, num_sand_particles=SWEEP_SAND_PARTICLES,
+              workers=None, checkpoint_every=CHECKPOINT_EVERY, progress=None):
+    done = completed_ids(output)
+    tasks = [
+        (config_id, overrides, base_settings, frames, dt, seed, num_particles, num_sand_particles)
+        for config_id, overrides in enumerate(configurations) if config_id not in done
+    ]
+    if not tasks:
+        return 0
+    columns = ['config_id'] + list(configurations[0]) + list(METRIC_COLUMNS)
+    new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+    with open(output, 'a', newline='') as f, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        if new_file:
+            writer.writeheader()
+        elif not _ends_with_newline(output):
+            f.write('\r\n')
+        futures = [executor.submit(run_configuration, task) for task in tasks]
+        for written, future in enumerate(as_completed(futures), 1):
+            writer.writerow(future.result())
+            if written % checkpoint_every == 0 or written == len(tasks):
+                f.flush()
+                os.fsync(f.fileno())
+                if progress:
+                    progress(len(done) + written, len(configurations))
+    return len(tasks)
+
+def sweep_command(args):
+    try:
+        parameters = dict(parse_parameter(p) for p in args.param)
+    except ValueError as e:
+        print(f"Błąd parametru: {e}")
+        return 2
+    if args.samples:
+        configurations = random_configurations(parameters, args.samples, args.seed)
+    else:
+        configurations = grid_configurations(parameters, args.steps)
+    base_settings = read_settings(args.settings)
+    spec = {
+        'parameters': args.param, 'samples': args.samples, 'steps': args.steps, 'seed': args.seed,
+        'frames': args.frames, 'dt': args.dt, 'particles': args.particles,
+        'sand_particles': args.sand_particles, 'base_settings': base_settings,
+    }
+    if not check_spec(args.output, spec):
+        print(f"Plik {args.output} pochodzi z innego przebiegu (inne parametry). Podaj nowy --output.")
+        return 1
+
+    def progress(finished, total):
+        elapsed = time.perf_counter() - start
+        print(f"{finished}/{total} konfiguracji, {elapsed:.1f} s")
+
+    start = time.perf_counter()
+    ran = run_sweep(configurations, args.output, base_settings, frames=args.frames, dt=args.dt,
+                    seed=args.seed, num_particles=args.particles, num_sand_particles=args.sand_particles,
+                    workers=args.workers, checkpoint_every=args.checkpoint_every, progress=progress)
+    print(f"Uruchomiono {ran} z {len(configurations)} konfiguracji w {time.perf_counter() - start:.1f} s, "
+          f"wyniki w {args.output}")
+    return 0
+
+def add_sweep_parser(commands, default_settings_file, default_dt):
+    sweep = commands.add_parser('sweep', help="Przegląd siatki lub losowej próbki ustawień na wszystkich rdzeniach.")
+    sweep.add_argument('--param', action='append', required=True,
+                       help="nazwa=min:max[:kroki] albo nazwa=a,b,c (można powtarzać).")
+    sweep.add_argument('--samples', type=int, default=0, help="Losowa próbka zamiast pełnej siatki.")
+    sweep.add_argument('--steps', type=int, default=5, help="Domyślna liczba kroków siatki na parametr.")
+    sweep.add_argument('--settings', default=default_settings_file)
+    sweep.add_argument('--frames', type=int, default=SWEEP_FRAMES)
+    sweep.add_argument('--dt', type=float, default=default_dt)
+    sweep.add_argument('--seed', type=int, default=0)
+    sweep.add_argument('--particles', type=int, default=SWEEP_PARTICLES)
+    sweep.add_argument('--sand-particles', type=int, default=SWEEP_SAND_PARTICLES)
+    sweep.add_argument('--workers', type=int, default=None, help="Liczba procesów (domyślnie wszystkie rdzenie).")
+    sweep.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY)
+    sweep.add_argument('--output', default='sweep_results.csv')
+    sweep.set_defaults(func=sweep_command)
+    return sweep
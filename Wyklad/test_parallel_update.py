@@ -0,0 +1,36 @@
+import hashlib
+import numpy as np
+import pytest
+from entities.cloud_system import CloudParticleSystem
+from entities.sand_system import SandParticleSystem
+from entities.random_streams import RandomStreams
+from parallel_update import ParallelUpdater, BACKEND_THREADS, BACKEND_PROCESSES
+
+DT = 1.0 / 60.0
+STEPS = 60  # piasek w połowie opadania: część slotów już zwolniona
+
+def state_digest(system):
+    h = hashlib.sha256()
+    for name, value in sorted(vars(system).items()):
+        if isinstance(value, np.ndarray):
+            h.update(name.encode())
+            h.update(np.ascontiguousarray(value).tobytes())
+    h.update(system.pool.owner.tobytes())
+    h.update(system.pool.free[:system.pool.free_count].tobytes())
+    return h.hexdigest()
+
+def run(system_class, updater):
+    system = system_class(3000, 1.0, None, RandomStreams(5))
+    system.activate()
+    for _ in range(STEPS):
+        updater.update(system, DT)
+    updater.close()
+    return state_digest(system)
+
+@pytest.mark.parametrize('system_class', [CloudParticleSystem, SandParticleSystem])
+def test_shards_match_serial_update(system_class):
+    serial = run(system_class, ParallelUpdater(workers=1))
+    threads = run(system_class, ParallelUpdater(workers=4, shard_size=256, backend=BACKEND_THREADS))
+    processes = run(system_class, ParallelUpdater(workers=4, shard_size=256, backend=BACKEND_PROCESSES))
+    assert threads == serial
+    assert processes == serial
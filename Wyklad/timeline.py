@@ -0,0 +1,66 @@
+import bisect
+from simulation import Simulation
+
+# Migawki co keyframe_interval s; skok w przód za ostatnią migawkę liczy wszystkie kroki od niej
+class Timeline:
+    def __init__(self, sim, dt, keyframe_interval=1.0):
+        self.dt = dt
+        self.keyframe_steps = max(1, round(keyframe_interval / dt))
+        # Własna kopia symulacji do przeliczania; symulacja okna zostaje nietknięta.
+        self.worker = Simulation(sim.params, sim.explosion_scale, sim.cloud.count, sim.sand.count,
+                                 budget_policy=sim.budget_policy, gpu_cloud=sim.gpu_cloud)
+        self.worker.particle_fraction = sim.particle_fraction
+        self.steps = []
+        self.keyframes = []
+        self.add_keyframe(sim, 0)
+
+    def add_keyframe(self, sim, step):
+        index = bisect.bisect_left(self.steps, step)
+        del self.steps[index:], self.keyframes[index:]
+        self.steps.append(step)
+        self.keyframes.append(sim.snapshot())
+
+    def capture(self, sim):
+        step = self.step_index(sim.time)
+        if step >= self.steps[-1] + self.keyframe_steps:
+            self.add_keyframe(sim, step)
+
+    def invalidate_after(self, sim):
+        self.add_keyframe(sim, self.step_index(sim.time))
+
+    def step_index(self, t):
+        return max(0, round(t / self.dt))
+
+    @property
+    def duration(self):
+        return self.steps[-1] * self.dt
+
+    def extend_to(self, t):
+        target = self.step_index(t)
+        if target <= self.steps[-1]:
+            return
+        worker = self.worker
+        worker.restore(self.keyframes[-1])
+        step = self.steps[-1]
+        while step < target:
+            worker.step(self.dt)
+            step += 1
+            if step % self.keyframe_steps == 0 or step == target:
+                self.steps.append(step)
+                self.keyframes.append(worker.snapshot())
+
+    def close(self):
+        self.worker.close()
+
+    def seek(self, sim, t):
+        self.extend_to(t)
+        target = self.step_index(t)
+        index = bisect.bisect_right(self.steps, target) - 1
+        sim.restore(self.keyframes[index])
+        for _ in range(target - self.steps[index]):
+            sim.step(self.dt)
+        return sim
+
+    # Wynik w roboczej kopii, ważny do następnego wywołania
+    def state_at(self, t):
+        return self.seek(self.worker, t)